@@ -6,9 +6,11 @@ Detects access, modification, and deletion events.
 """
 
 import time
+import hashlib
 import logging
 import threading
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, asdict
@@ -16,17 +18,36 @@ from multiprocessing import Queue
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
 
+from server.protocol import dumps_json
+
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:  # optional; FileHashTracker(algorithm="blake3") needs it
+    _blake3 = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="[%(asctime)s] %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+# hashlib.file_digest (Python 3.11+) streams the whole file in C
+_HAS_FILE_DIGEST = hasattr(hashlib, "file_digest")
+
+# Hashes of files modified more recently than this are not cached: a second
+# write within the filesystem's timestamp granularity could keep the same stat
+RACY_MTIME_WINDOW_NS = 2 * 1_000_000_000
+
+# Digest algorithms FileHashTracker can fingerprint files with
+HASH_ALGORITHMS = ("sha256", "blake3")
+
 
-@dataclass
+@dataclass(slots=True)
 class MonitorEvent:
     """
     File system event detected by monitor.
+
+    Slotted so each queued event carries no per-instance __dict__.
     """
 
     token_id: str  # Identifier for the honeytoken
@@ -40,51 +61,126 @@ class MonitorEvent:
     process_id: Optional[int] = None  # PID of accessing process
     process_user: Optional[str] = None  # User running the process
     process_cmdline: Optional[str] = None  # Command line of the process
-    file_hash_original: Optional[str] = None  # Original file hash (SHA256)
-    file_hash_current: Optional[str] = None  # Current file hash (SHA256)
+    file_hash_original: Optional[str] = None  # Original file hash (tracker's algorithm)
+    file_hash_current: Optional[str] = None  # Current file hash (tracker's algorithm)
     content_modified: bool = False  # Whether file content changed
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return asdict(self)
 
+    def to_json(self) -> bytes:
+        """Serialize to UTF-8 JSON bytes."""
+        return dumps_json(self.to_dict())
+
 
 class FileHashTracker:
     """    
-    Uses SHA256 checksums to detect when honeytoken content is modified,
+    Uses file checksums to detect when honeytoken content is modified,
     allowing detection of file access that changes content.
+
+    SHA256 is the default and what FSMonitor uses. BLAKE3 can be selected
+    when the ``blake3`` package is installed (it is not a requirement);
+    it is much faster on large files and hashes a single file across
+    several cores.
     """
 
-    def __init__(self):
-        """Initialize hash tracker with empty cache."""
+    def __init__(self, algorithm: str = "sha256"):
+        """
+        Initialize hash tracker with empty cache.
+
+        Args:
+            algorithm: Digest algorithm, one of HASH_ALGORITHMS
+
+        Raises:
+            ValueError: If the algorithm is unknown or not installed
+        """
+        if algorithm not in HASH_ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+        if algorithm == "blake3" and _blake3 is None:
+            raise ValueError("blake3 hashing requires the 'blake3' package")
+
+        self.algorithm = algorithm
         self.file_hashes = {}  # file_path -> hash_value
+        self._stat_cache = {}  # file_path -> (stat identity, current hash)
+        # OpenSSL picks SHA-NI/AVX2 itself; this only selects the Python side
+        self.backend = "file_digest" if _HAS_FILE_DIGEST else "portable"
 
     def calculate_hash(self, file_path: str) -> Optional[str]:
         """
-        Calculate SHA256 hash of file contents.
+        Calculate the hash of file contents with the configured algorithm.
+
+        The result is cached against the file's stat identity (device, inode,
+        size, mtime and ctime), so an unchanged file costs one stat() call.
+        ctime is included because it cannot be rolled back from user space,
+        which keeps a content change hidden behind a reset mtime detectable.
 
         Args:
             file_path: Path to file
 
         Returns:
-            Hex-encoded SHA256 hash or None if file cannot be read
+            Hex-encoded hash or None if file cannot be read
         """
         try:
-            import hashlib
+            st = os.stat(file_path)
+        except OSError as e:
+            logger.debug(f"Failed to calculate hash for {file_path}: {e}")
+            return None
 
-            sha256_hash = hashlib.sha256()
+        stat_key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+        cached = self._stat_cache.get(file_path)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
 
-            # Read file in chunks to handle large files efficiently
+        hash_value = self._hash_file(file_path)
+        if hash_value and time.time_ns() - st.st_mtime_ns > RACY_MTIME_WINDOW_NS:
+            self._stat_cache[file_path] = (stat_key, hash_value)
+        return hash_value
+
+    def _new_hasher(self):
+        """Return a fresh hash object for the configured algorithm."""
+        if self.algorithm == "blake3":
+            return _blake3(max_threads=_blake3.AUTO)
+        return hashlib.sha256()
+
+    def _hash_file(self, file_path: str) -> Optional[str]:
+        """Read and hash a file with the selected backend (no caching)."""
+        try:
             with open(file_path, "rb") as f:
+                if self.backend == "file_digest":
+                    return hashlib.file_digest(f, self._new_hasher).hexdigest()
+
+                # Portable path: read file in chunks to handle large files
+                hasher = self._new_hasher()
                 for chunk in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(chunk)
+                    hasher.update(chunk)
 
-            return sha256_hash.hexdigest()
+            return hasher.hexdigest()
 
         except (IOError, OSError) as e:
             logger.debug(f"Failed to calculate hash for {file_path}: {e}")
             return None
 
+    def calculate_hashes(self, file_paths: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Calculate hashes of several files concurrently.
+
+        hashlib releases the GIL while digesting, so a thread pool hashes
+        independent files in parallel.
+
+        Args:
+            file_paths: Paths to files
+
+        Returns:
+            Mapping of file path to hex-encoded hash (None if unreadable)
+        """
+        if len(file_paths) < 2:
+            return {path: self.calculate_hash(path) for path in file_paths}
+
+        workers = min(len(file_paths), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(file_paths, pool.map(self.calculate_hash, file_paths)))
+
     def get_original_hash(self, file_path: str) -> Optional[str]:
         """
         Get the original (stored) hash for a file.
@@ -117,17 +213,21 @@ class FileHashTracker:
 
         return hash_value
 
-    def has_content_changed(self, file_path: str) -> bool:
+    def has_content_changed(
+        self, file_path: str, current_hash: Optional[str] = None
+    ) -> bool:
         """
         Check if file content has changed since original hash was stored.
 
         Args:
             file_path: Path to file
+            current_hash: Hash the caller already computed (if None, calculate it)
 
         Returns:
             True if content changed or file is new/deleted
         """
-        current_hash = self.calculate_hash(file_path)
+        if current_hash is None:
+            current_hash = self.calculate_hash(file_path)
         original_hash = self.get_original_hash(file_path)
 
         # If no original hash, consider it unchanged (first time seeing it)
@@ -257,7 +357,9 @@ class HoneytokenHandler(FileSystemEventHandler):
             try:
                 file_hash_current = self.hash_tracker.calculate_hash(src_path)
                 file_hash_original = self.hash_tracker.get_original_hash(src_path)
-                content_modified = self.hash_tracker.has_content_changed(src_path)
+                content_modified = self.hash_tracker.has_content_changed(
+                    src_path, file_hash_current
+                )
                 
                 # Store the current hash for future comparisons
                 if file_hash_current:
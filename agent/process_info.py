@@ -7,11 +7,16 @@ Captures process details when files are accessed.
 import psutil
 import os
 import platform
-from typing import Dict, Optional, Any
+import time
+from typing import Dict, Optional, Any, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Full process scans are O(processes x open files); reuse results this long
+PROCESS_SCAN_CACHE_SECONDS = 2.0
+PROCESS_SCAN_CACHE_SIZE = 256
+
 
 class ProcessCapture:
     """
@@ -25,6 +30,9 @@ class ProcessCapture:
     - Parent process information
     """
 
+    # normalized path -> (monotonic scan time, process info list)
+    _scan_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+
     @staticmethod
     def get_process_by_file_access(file_path: str) -> Optional[Dict[str, Any]]:
         """
@@ -194,6 +202,8 @@ class ProcessCapture:
         Get all processes that might have access to a file path.
         
         This is useful for forensic analysis after a honeytoken trigger.
+        Repeated queries for the same path within PROCESS_SCAN_CACHE_SECONDS
+        reuse the previous scan instead of walking every process again.
         
         Args:
             file_path: Path to check
@@ -201,9 +211,14 @@ class ProcessCapture:
         Returns:
             List of process info dictionaries
         """
-        processes = []
         normalized_path = os.path.abspath(file_path)
-        
+        now = time.monotonic()
+
+        cached = ProcessCapture._scan_cache.get(normalized_path)
+        if cached is not None and now - cached[0] < PROCESS_SCAN_CACHE_SECONDS:
+            return [dict(proc_info) for proc_info in cached[1]]
+
+        processes = []
         try:
             for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'username']):
                 try:
@@ -215,9 +230,14 @@ class ProcessCapture:
                 except (psutil.AccessDenied, psutil.NoSuchProcess):
                     continue
         except Exception as e:
+            # A failed scan is not cached, so the next query retries
             logger.debug(f"Error scanning processes: {e}")
-        
-        return processes
+            return processes
+
+        if len(ProcessCapture._scan_cache) >= PROCESS_SCAN_CACHE_SIZE:
+            ProcessCapture._scan_cache.clear()
+        ProcessCapture._scan_cache[normalized_path] = (now, processes)
+        return [dict(proc_info) for proc_info in processes]
 
 
 # Example usage and testing
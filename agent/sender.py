@@ -12,7 +12,7 @@ import logging
 import threading
 import queue
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any
 from multiprocessing import Queue
 from collections import deque
 
@@ -42,31 +42,48 @@ class RateLimiter:
     """
     Token bucket rate limiter.
     Limits events per second with burst capacity.
+
+    Elapsed time is measured with the monotonic clock in integer
+    nanoseconds, so the bucket cannot be drained or overfilled by wall-clock
+    adjustments (NTP steps, manual clock changes).
     """
 
-    def __init__(self, rate: float = 10.0, burst: int = 20):
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 20,
+        time_fn: Callable[[], int] = time.monotonic_ns,
+        sleep_fn: Callable[[float], None] = time.sleep,
+    ):
         """
         Initialize rate limiter.
 
         Args:
             rate: Events per second (refill rate)
             burst: Maximum burst capacity (bucket size)
+            time_fn: Monotonic clock returning integer nanoseconds
+            sleep_fn: Sleep function taking seconds (replaceable in tests
+                together with time_fn)
         """
         self.rate = rate  # tokens per second
         self.burst = burst  # max tokens
         self.tokens = float(burst)  # current tokens
-        self.last_refill = time.time()
+        self._rate_per_ns = rate / 1_000_000_000
+        self._time_fn = time_fn
+        self._sleep_fn = sleep_fn
+        self.last_refill_ns = time_fn()
         self.lock = threading.Lock()
 
-    def _refill(self):
-        """Refill tokens based on elapsed time."""
-        now = time.time()
-        elapsed = now - self.last_refill
+    def _refill(self) -> float:
+        """Refill tokens based on elapsed time and return the new count."""
+        now = self._time_fn()
+        elapsed_ns = now - self.last_refill_ns
 
         # Add tokens based on rate
-        new_tokens = elapsed * self.rate
-        self.tokens = min(self.burst, self.tokens + new_tokens)
-        self.last_refill = now
+        tokens = min(self.burst, self.tokens + elapsed_ns * self._rate_per_ns)
+        self.tokens = tokens
+        self.last_refill_ns = now
+        return tokens
 
     def acquire(
         self, tokens: int = 1, blocking: bool = True, timeout: float = None
@@ -80,29 +97,41 @@ class RateLimiter:
             timeout: Maximum wait time (None = infinite)
 
         Returns:
-            True if tokens acquired, False otherwise
+            True if tokens acquired, False otherwise. A blocking call
+            returns False immediately when the tokens cannot refill within
+            the timeout, or ever (more than burst requested, or zero rate).
         """
-        start_time = time.time()
+        if tokens <= 0:
+            # Nothing to consume, so no need to take the lock or refill
+            return True
+
+        time_fn = self._time_fn
+        # Non-blocking calls never wait, so skip the clock read for them
+        deadline = None
+        if blocking and timeout is not None:
+            deadline = time_fn() + timeout * 1e9
 
         while True:
             with self.lock:
-                self._refill()
+                available = self._refill()
 
-                if self.tokens >= tokens:
-                    self.tokens -= tokens
+                if available >= tokens:
+                    self.tokens = available - tokens
                     return True
 
-                if not blocking:
+                if not blocking or tokens > self.burst or self.rate <= 0:
                     return False
 
-            # Check timeout
-            if timeout is not None:
-                elapsed = time.time() - start_time
-                if elapsed >= timeout:
-                    return False
+                # Sleep exactly until the deficit has refilled
+                wait = (tokens - available) / self.rate
+
+            if deadline is not None and time_fn() + wait * 1e9 > deadline:
+                # The tokens cannot arrive in time, so fail now instead of
+                # sleeping out the timeout first
+                return False
 
-            # Wait before retry
-            time.sleep(0.01)
+            # Loops again only if another thread took the refilled tokens
+            self._sleep_fn(wait)
 
     def get_tokens(self) -> float:
         """Get current token count."""
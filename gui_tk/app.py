@@ -40,6 +40,7 @@ class HoneyGridApp:
         db_path: str = "data/honeygrid.db",
         db_password: str = "change_this_password",
         server_queue: queue.Queue = None,
+        root: tk.Tk = None,
     ):
         """
         Initialize GUI application.
@@ -48,6 +49,7 @@ class HoneyGridApp:
             db_path: Database file path
             db_password: Database encryption password
             server_queue: Queue for receiving events from server
+            root: Existing Tk root or Toplevel to build into (created if None)
         """
         self.db_path = db_path
         self.db_password = db_password
@@ -60,8 +62,8 @@ class HoneyGridApp:
         self.theme_manager = get_theme_manager()
         self.current_theme = self.theme_manager.get_theme()
 
-        # Main window
-        self.root = tk.Tk()
+        # Main window (reuse caller's root so only one Tk interpreter exists)
+        self.root = root if root is not None else tk.Tk()
         self.root.title("HoneyGrid Dashboard")
         self.root.geometry("1200x700")
 
@@ -22,6 +22,22 @@ import base64
 
 logger = logging.getLogger(__name__)
 
+# Shared by insert_event() and insert_events_bulk()
+INSERT_EVENT_SQL = """
+    INSERT INTO events 
+    (agent_id, token_id, path, event_type, timestamp, nonce, data,
+     process_name, process_id, process_user, process_cmdline,
+     file_hash_original, file_hash_current, content_modified)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Shared by update_agent_status() and insert_events_bulk()
+UPDATE_AGENT_STATUS_SQL = """
+    UPDATE agents 
+    SET status = ?, last_seen = ?
+    WHERE agent_id = ?
+"""
+
 
 class DatabaseError(Exception):
     """Base exception for database errors."""
@@ -273,14 +289,7 @@ class DatabaseManager:
         cursor = self.connection.cursor()
         timestamp = int(time.time())
 
-        cursor.execute(
-            """
-            UPDATE agents 
-            SET status = ?, last_seen = ?
-            WHERE agent_id = ?
-        """,
-            (status, timestamp, agent_id),
-        )
+        cursor.execute(UPDATE_AGENT_STATUS_SQL, (status, timestamp, agent_id))
 
         self.connection.commit()
         return cursor.rowcount > 0
@@ -384,13 +393,7 @@ class DatabaseManager:
 
         try:
             cursor.execute(
-                """
-                INSERT INTO events 
-                (agent_id, token_id, path, event_type, timestamp, nonce, data,
-                 process_name, process_id, process_user, process_cmdline,
-                 file_hash_original, file_hash_current, content_modified)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+                INSERT_EVENT_SQL,
                 (
                     agent_id,
                     token_id,
@@ -423,6 +426,67 @@ class DatabaseManager:
                 )
             raise DatabaseError(f"Database integrity error: {e}")
 
+    def insert_events_bulk(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Insert multiple events in a single transaction.
+
+        Args:
+            events: Event dictionaries using the insert_event() argument names
+
+        Returns:
+            Number of events inserted
+
+        Raises:
+            DatabaseError: If a nonce already exists (replay attack)
+        """
+        timestamp = int(time.time())
+
+        rows = [
+            (
+                event["agent_id"],
+                event.get("token_id"),
+                self.encrypt(event["path"]),
+                event["event_type"],
+                (
+                    event["timestamp"]
+                    if event.get("timestamp") is not None
+                    else timestamp
+                ),
+                event["nonce"],
+                self.encrypt(json.dumps(event.get("data") or {})),
+                event.get("process_name"),
+                event.get("process_id"),
+                event.get("process_user"),
+                event.get("process_cmdline"),
+                event.get("file_hash_original"),
+                event.get("file_hash_current"),
+                1 if event.get("content_modified") else 0,
+            )
+            for event in events
+        ]
+        agent_ids = {row[0] for row in rows}
+
+        cursor = self.connection.cursor()
+
+        try:
+            with self.connection:
+                cursor.executemany(INSERT_EVENT_SQL, rows)
+
+                # Update agent last_seen (event = potential breach)
+                cursor.executemany(
+                    UPDATE_AGENT_STATUS_SQL,
+                    [("warning", timestamp, agent_id) for agent_id in agent_ids],
+                )
+
+            return len(rows)
+
+        except sqlite3.IntegrityError as e:
+            if "nonce" in str(e):
+                raise DatabaseError(
+                    f"Duplicate nonce detected in batch (possible replay attack): {e}"
+                )
+            raise DatabaseError(f"Database integrity error: {e}")
+
     def get_event(self, event_id: int) -> Optional[Dict[str, Any]]:
         """
         Get event by ID.
@@ -19,6 +19,14 @@ class DiscordNotifier(Notifier):
     Discord notification channel using webhooks.
     """
 
+    _SEVERITY_COLORS = {
+        Severity.INFO: 0x3498DB,
+        Severity.LOW: 0x2ECC71,
+        Severity.MEDIUM: 0xF39C12,
+        Severity.HIGH: 0xE67E22,
+        Severity.CRITICAL: 0xE74C3C,
+    }
+
     def __init__(
         self,
         config: NotificationConfig,
@@ -42,14 +50,6 @@ class DiscordNotifier(Notifier):
         if not self.webhook_url:
             logger.warning("No Discord webhook URL configured")
 
-        self._severity_colors = {
-            Severity.INFO: 0x3498DB,
-            Severity.LOW: 0x2ECC71,
-            Severity.MEDIUM: 0xF39C12,
-            Severity.HIGH: 0xE67E22,
-            Severity.CRITICAL: 0xE74C3C,
-        }
-
     async def send(self, event: Dict[str, Any]) -> bool:
         """Send single event notification to Discord."""
         if not self.webhook_url:
@@ -102,7 +102,7 @@ class DiscordNotifier(Notifier):
 
     def _get_embed_color(self, severity: Severity) -> int:
         """Return embed color for severity."""
-        return self._severity_colors.get(severity, 0x95A5A6)
+        return self._SEVERITY_COLORS.get(severity, 0x95A5A6)
 
     def _get_severity_emoji(self, severity: Severity) -> str:
         """Return emoji for severity."""
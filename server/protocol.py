@@ -9,7 +9,7 @@ Protocol Format:
 JSON Payload Structure:
     {
         "header": {
-            "nonce": "base64-encoded 12-byte random value",
+            "nonce": "URL-safe base64-encoded 12-byte random value",
             "timestamp": 1234567890,  # Unix timestamp (seconds)
             "agent_id": "agent-001",
             "msg_type": "event" | "heartbeat" | "deploy_response"
@@ -28,10 +28,18 @@ import base64
 from typing import Dict, Any, Tuple, Optional
 from dataclasses import dataclass, asdict
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used instead
+    orjson = None
+
 # Protocol Constants
 HEADER_LENGTH = 4  # 4 bytes for length prefix
+LENGTH_PREFIX = struct.Struct("!I")  # Precompiled big-endian uint32 codec
 MAX_MESSAGE_SIZE = 1024 * 1024  # 1 MB maximum message size
 NONCE_SIZE = 12  # 12 bytes for nonce
+NONCE_B64_LENGTH = ((NONCE_SIZE + 2) // 3) * 4  # Encoded nonce length (16 chars)
+VALID_MSG_TYPES = frozenset({"event", "heartbeat", "deploy_response", "status"})
 TIMESTAMP_TOLERANCE = 60  # ±60 seconds tolerance for timestamp validation
 
 
@@ -63,7 +71,7 @@ class MessageTooLargeError(ProtocolError):
 class MessageHeader:
     """Message header containing metadata."""
 
-    nonce: str  # Base64-encoded nonce
+    nonce: str  # URL-safe base64-encoded nonce
     timestamp: int  # Unix timestamp
     agent_id: str
     msg_type: str  # "event", "heartbeat", "deploy_response"
@@ -82,8 +90,17 @@ class MessageHeader:
         # Validate nonce
         if not self.nonce:
             raise ValidationError("Missing nonce")
+        if not isinstance(self.nonce, str):
+            raise ValidationError("Invalid nonce encoding: nonce must be a string")
+        # Cheap length check rejects most malformed nonces before decoding
+        if len(self.nonce) != NONCE_B64_LENGTH:
+            raise ValidationError(
+                f"Invalid nonce size: {len(self.nonce)} chars "
+                f"(expected {NONCE_B64_LENGTH})"
+            )
         try:
-            nonce_bytes = base64.b64decode(self.nonce)
+            # Accept both alphabets so older agents' standard base64 still passes
+            nonce_bytes = base64.b64decode(self.nonce, altchars=b"-_")
             if len(nonce_bytes) != NONCE_SIZE:
                 raise ValidationError(
                     f"Invalid nonce size: {len(nonce_bytes)} (expected {NONCE_SIZE})"
@@ -107,8 +124,7 @@ class MessageHeader:
             raise ValidationError("Invalid agent_id")
 
         # Validate message type
-        valid_types = ["event", "heartbeat", "deploy_response", "status"]
-        if self.msg_type not in valid_types:
+        if not isinstance(self.msg_type, str) or self.msg_type not in VALID_MSG_TYPES:
             raise ValidationError(f"Invalid msg_type: {self.msg_type}")
 
 
@@ -140,10 +156,9 @@ def generate_nonce() -> str:
     Generate a cryptographically secure random nonce.
 
     Returns:
-        Base64-encoded 12-byte nonce
+        URL-safe base64-encoded 12-byte nonce (16 chars, no padding)
     """
-    nonce_bytes = secrets.token_bytes(NONCE_SIZE)
-    return base64.b64encode(nonce_bytes).decode("ascii")
+    return secrets.token_urlsafe(NONCE_SIZE)
 
 
 def create_message(
@@ -176,6 +191,48 @@ def create_message(
     return message
 
 
+def dumps_json(obj: Any) -> bytes:
+    """
+    Serialize an object to UTF-8 JSON bytes.
+
+    Uses orjson when installed, which writes bytes directly from the
+    Python objects; otherwise falls back to the stdlib json module.
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode("utf-8")
+
+
+def loads_json(payload: bytes) -> Any:
+    """
+    Deserialize UTF-8 JSON bytes.
+
+    Uses orjson when installed, which decodes and parses in one pass;
+    otherwise falls back to the stdlib json module. orjson.JSONDecodeError
+    subclasses json.JSONDecodeError, so callers handle both the same way.
+
+    Args:
+        payload: UTF-8 encoded JSON
+
+    Returns:
+        Deserialized object
+
+    Raises:
+        json.JSONDecodeError: If payload is not valid JSON (or, with orjson,
+            not valid UTF-8)
+        UnicodeDecodeError: If payload is not valid UTF-8 (stdlib json)
+    """
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload.decode("utf-8"))
+
+
 def frame_message(message: Message) -> bytes:
     """
     Frame a message for transmission.
@@ -190,7 +247,7 @@ def frame_message(message: Message) -> bytes:
         MessageTooLargeError: If message exceeds maximum size
     """
     # Serialize to JSON
-    json_data = json.dumps(message.to_dict()).encode("utf-8")
+    json_data = dumps_json(message.to_dict())
 
     # Check size
     if len(json_data) > MAX_MESSAGE_SIZE:
@@ -199,7 +256,7 @@ def frame_message(message: Message) -> bytes:
         )
 
     # Create length prefix (4 bytes, big-endian)
-    length_prefix = struct.pack("!I", len(json_data))
+    length_prefix = LENGTH_PREFIX.pack(len(json_data))
 
     return length_prefix + json_data
 
@@ -225,7 +282,7 @@ async def read_frame(reader) -> bytes:
         raise EOFError("Connection closed")
 
     # Unpack length
-    message_length = struct.unpack("!I", length_data)[0]
+    message_length = LENGTH_PREFIX.unpack(length_data)[0]
 
     # Validate length
     if message_length == 0:
@@ -266,7 +323,7 @@ def read_frame_sync(sock) -> bytes:
         raise EOFError("Connection closed")
 
     # Unpack length
-    message_length = struct.unpack("!I", length_data)[0]
+    message_length = LENGTH_PREFIX.unpack(length_data)[0]
 
     # Validate length
     if message_length == 0:
@@ -327,7 +384,7 @@ def parse_message(payload: bytes) -> Message:
         ValidationError: If message is invalid
     """
     try:
-        data = json.loads(payload.decode("utf-8"))
+        data = loads_json(payload)
     except json.JSONDecodeError as e:
         raise ValidationError(f"Invalid JSON: {e}")
     except UnicodeDecodeError as e:
@@ -409,7 +466,7 @@ if __name__ == "__main__":
     # Frame the message
     framed = frame_message(msg)
     print(f"\n2. Framed Message: {len(framed)} bytes")
-    print(f"   Length prefix: {struct.unpack('!I', framed[:4])[0]} bytes")
+    print(f"   Length prefix: {LENGTH_PREFIX.unpack_from(framed)[0]} bytes")
 
     # Parse it back
     payload = framed[4:]
@@ -49,8 +49,17 @@ load_env()
 class LRUCache:
     """
     LRU cache for nonce replay protection.
+
+    Backed by an OrderedDict used as an ordered set, so add, contains and
+    eviction are all O(1). contains() is a pure membership test and does
+    not refresh an entry's recency; only add() does.
+
+    The cache is only touched from the server's event loop thread, so it
+    takes no lock; keep it that way rather than sharing it across threads.
     """
 
+    __slots__ = ("cache", "max_size")
+
     def __init__(self, max_size: int = 1000):
         """
         Initialize LRU cache.
@@ -63,15 +72,42 @@ class LRUCache:
 
     def add(self, key: str):
         """Add key to cache."""
+        # Keys are not sys.intern()ed: each nonce arrives as a fresh string,
+        # so interning would cost an extra table probe per message, and str
+        # already caches its hash for the contains()/add() pair
         if key in self.cache:
             # Move to end (most recently used)
             self.cache.move_to_end(key)
         else:
-            self.cache[key] = True
+            self.cache[key] = None
             # Remove oldest if over limit
             if len(self.cache) > self.max_size:
                 self.cache.popitem(last=False)
 
+    def check_and_add(self, key: str) -> bool:
+        """
+        Add key unless it is already cached.
+
+        Combines contains() and add() so a fresh key is hashed and probed
+        once less than calling both.
+
+        Args:
+            key: Key to check and insert
+
+        Returns:
+            True if the key was new (and is now cached), False if it was
+            already present (it is moved to most recently used)
+        """
+        cache = self.cache
+        if key in cache:
+            cache.move_to_end(key)
+            return False
+
+        cache[key] = None
+        if len(cache) > self.max_size:
+            cache.popitem(last=False)
+        return True
+
     def contains(self, key: str) -> bool:
         """Check if key exists in cache."""
         return key in self.cache
@@ -81,11 +117,63 @@ class LRUCache:
         return len(self.cache)
 
 
+def _extract_agent_id(writer: asyncio.StreamWriter, addr: tuple) -> str:
+    """
+    Derive the agent ID from the client's TLS certificate.
+
+    Args:
+        writer: Async stream writer of the connection
+        addr: Client address
+
+    Returns:
+        Certificate commonName ("unknown" if the cert has none), or
+        "unknown_<ip>_<port>" when no certificate was presented
+    """
+    # The transport caches the decoded cert from the handshake
+    peer_cert = writer.get_extra_info("peercert")
+    if not peer_cert:
+        return f"unknown_{addr[0]}_{addr[1]}"
+
+    # Single pass over the subject RDNs, stopping at the first CN
+    agent_id = next(
+        (
+            value
+            for rdn in peer_cert.get("subject", ())
+            for key, value in rdn
+            if key == "commonName"
+        ),
+        "unknown",
+    )
+    logger.info(f"Client connected: {agent_id} from {addr[0]}:{addr[1]}")
+    return agent_id
+
+
 class ClientHandler:
     """
     Handles individual client connection.
+
+    Slotted: one instance lives per connected agent, so dropping the
+    per-instance __dict__ adds up with many agents.
+
+    There is a single handler class for all connections: the server
+    requires client certificates at the TLS layer, and the only
+    per-message authorization is the agent ID check against the
+    certificate commonName in _process_message.
     """
 
+    __slots__ = (
+        "reader",
+        "writer",
+        "db",
+        "nonce_cache",
+        "event_queue",
+        "notifiers",
+        "addr",
+        "agent_id",
+        "is_authenticated",
+        "message_count",
+    )
+
     def __init__(
         self,
         reader: asyncio.StreamReader,
@@ -95,6 +183,7 @@ class ClientHandler:
         event_queue: Queue,
         notifiers: list,
         addr: tuple,
+        agent_id: Optional[str] = None,
     ):
         """
         Initialize client handler.
@@ -107,6 +196,8 @@ class ClientHandler:
             event_queue: Queue for GUI notifications
             notifiers: List of notification channels
             addr: Client address
+            agent_id: Agent ID already taken from the peer certificate;
+                extracted from the writer when omitted
         """
         self.reader = reader
         self.writer = writer
@@ -116,24 +207,10 @@ class ClientHandler:
         self.notifiers = notifiers
         self.addr = addr
 
-        self.agent_id = None
+        self.agent_id = agent_id or _extract_agent_id(writer, addr)
         self.is_authenticated = False
         self.message_count = 0
 
-        # Get agent certificate info
-        ssl_object = writer.get_extra_info("ssl_object")
-        if ssl_object:
-            peer_cert = ssl_object.getpeercert()
-            if peer_cert:
-                subject = dict(x[0] for x in peer_cert["subject"])
-                self.agent_id = subject.get("commonName", "unknown")
-                logger.info(
-                    f"Client connected: {self.agent_id} from {addr[0]}:{addr[1]}"
-                )
-
-        if not self.agent_id:
-            self.agent_id = f"unknown_{addr[0]}_{addr[1]}"
-
     async def handle(self):
         """Handle client connection."""
         try:
@@ -190,18 +267,15 @@ class ClientHandler:
             )
             return
 
-        # Replay protection: check nonce
+        # Replay protection: record nonce, rejecting one already seen
         nonce = message.header.nonce
-        if self.nonce_cache.contains(nonce):
+        if not self.nonce_cache.check_and_add(nonce):
             logger.warning(
                 f"[{self.agent_id}] REPLAY ATTACK DETECTED! "
                 f"Duplicate nonce: {nonce}"
             )
             raise ValidationError("Duplicate nonce (replay attack)")
 
-        # Add nonce to cache
-        self.nonce_cache.add(nonce)
-
         # Process based on message type
         msg_type = message.header.msg_type
 
@@ -523,6 +597,7 @@ class HoneyGridServer:
     ):
         """Handle new client connection."""
         addr = writer.get_extra_info("peername")
+        agent_id = _extract_agent_id(writer, addr)
 
         self.stats["total_connections"] += 1
         self.stats["active_connections"] += 1
@@ -536,6 +611,7 @@ class HoneyGridServer:
             self.event_queue,
             self.notifiers,
             addr,
+            agent_id=agent_id,
         )
 
         # Handle connection
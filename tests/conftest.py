@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Shared pytest configuration for HoneyGrid tests.
+Pytest imports this before collecting any test module.
+"""
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add project root to path once for every test module
+ROOT = str(Path(__file__).parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Set TCL/TK library paths before any Tk imports to avoid "Can't find init.tcl" errors
+if "TCL_LIBRARY" not in os.environ:
+    python_dir = sys.base_prefix  # Get the base Python installation directory
+    tcl_dir = os.path.join(python_dir, "tcl")
+
+    if os.path.exists(tcl_dir):
+        tcl_lib = os.path.join(tcl_dir, "tcl8.6")
+        tk_lib = os.path.join(tcl_dir, "tk8.6")
+
+        if os.path.exists(tcl_lib):
+            os.environ["TCL_LIBRARY"] = tcl_lib
+        if os.path.exists(tk_lib):
+            os.environ["TK_LIBRARY"] = tk_lib
+
+
+def pytest_addoption(parser):
+    """Add HoneyGrid-specific command line options."""
+    parser.addoption(
+        "--skip-slow",
+        action="store_true",
+        default=False,
+        help="skip tests marked slow (e.g. full system process scans)",
+    )
+
+
+def pytest_configure(config):
+    """Register custom markers."""
+    config.addinivalue_line(
+        "markers",
+        "serial: starts real watchdog observers with timing-based asserts; "
+        'deselect with -m "not serial" under pytest-xdist',
+    )
+    config.addinivalue_line(
+        "markers", "slow: scans system-wide state; skipped with --skip-slow"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests when --skip-slow is given."""
+    if not config.getoption("--skip-slow"):
+        return
+
+    skip_slow = pytest.mark.skip(reason="--skip-slow given")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture
+def make_test_db():
+    """
+    Factory for connected DatabaseManager instances tuned for tests.
+
+    Test databases are thrown away, so commits skip fsync and the
+    rollback journal and temp tables stay in memory.
+    """
+    from server.db import DatabaseManager
+
+    created = []
+
+    def _make(db_path, password="test_pass"):
+        db = DatabaseManager(str(db_path), password)
+        db.connect()
+        db.connection.execute("PRAGMA synchronous = OFF")
+        db.connection.execute("PRAGMA journal_mode = MEMORY")
+        db.connection.execute("PRAGMA temp_store = MEMORY")
+        created.append(db)
+        return db
+
+    yield _make
+
+    for db in created:
+        db.close()
+
+
+@pytest.fixture
+def mem_db(make_test_db):
+    """Create in-memory database for tests that never inspect persistence."""
+    return make_test_db(":memory:")
+
+
+@pytest.fixture(scope="session")
+def mp_session_queue():
+    """Manager-backed queue shared by the whole session (one helper process)."""
+    manager = multiprocessing.Manager()
+
+    yield manager.Queue()
+
+    manager.shutdown()
+
+
+@pytest.fixture
+def mp_queue(mp_session_queue):
+    """Process-safe event queue, drained so each test starts and ends empty."""
+    while not mp_session_queue.empty():
+        mp_session_queue.get_nowait()
+
+    yield mp_session_queue
+
+    while not mp_session_queue.empty():
+        mp_session_queue.get_nowait()
+
+
+@pytest.fixture(scope="session")
+def fast_tmp(tmp_path_factory):
+    """Session scratch directory on tmpfs (/dev/shm) when the OS provides one."""
+    shm = Path("/dev/shm")
+    if not (shm.is_dir() and os.access(shm, os.W_OK)):
+        yield tmp_path_factory.mktemp("fast")
+        return
+
+    root = Path(tempfile.mkdtemp(prefix="honeygrid-", dir=shm))
+    yield root
+    shutil.rmtree(root, ignore_errors=True)
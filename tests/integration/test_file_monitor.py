@@ -11,13 +11,14 @@ import tempfile
 import shutil
 from pathlib import Path
 import sys
-import multiprocessing
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from agent.monitor import FSMonitor, MonitorEvent
 
+# Real observers and sleep-based assertions; keep out of parallel runs
+pytestmark = pytest.mark.serial
 
 @pytest.fixture
 def temp_watch_dir():
@@ -32,10 +33,9 @@ def temp_watch_dir():
 class TestFileMonitoring:
     """Test file system monitoring."""
 
-    def test_monitor_detects_file_creation(self, temp_watch_dir):
+    def test_monitor_detects_file_creation(self, temp_watch_dir, mp_queue):
         """Test that monitor detects new file creation."""
-        # Create queue
-        event_queue = multiprocessing.Manager().Queue()
+        event_queue = mp_queue
 
         # Create and start monitor
         monitor = FSMonitor(event_queue)
@@ -76,15 +76,15 @@ class TestFileMonitoring:
         finally:
             monitor.stop()
 
-    def test_monitor_detects_file_modification(self, temp_watch_dir):
+    def test_monitor_detects_file_modification(self, temp_watch_dir, mp_queue):
         """Test that monitor detects file modifications."""
         # Create initial file
         test_file = os.path.join(temp_watch_dir, "test_modify.txt")
         with open(test_file, "w") as f:
             f.write("initial content")
 
-        # Create queue and monitor
-        event_queue = multiprocessing.Manager().Queue()
+        # Create monitor
+        event_queue = mp_queue
         monitor = FSMonitor(event_queue)
         monitor.add_watch_path(temp_watch_dir, token_id="test-token-002")
         monitor.start()
@@ -115,7 +115,7 @@ class TestFileMonitoring:
         finally:
             monitor.stop()
 
-    def test_monitor_detects_file_deletion(self, temp_watch_dir):
+    def test_monitor_detects_file_deletion(self, temp_watch_dir, mp_queue):
         """Test that monitor detects file deletion."""
         # Create file
         test_file = os.path.join(temp_watch_dir, "test_delete.txt")
@@ -123,7 +123,7 @@ class TestFileMonitoring:
             f.write("to be deleted")
 
         # Create monitor
-        event_queue = multiprocessing.Manager().Queue()
+        event_queue = mp_queue
         monitor = FSMonitor(event_queue)
         monitor.add_watch_path(temp_watch_dir, token_id="test-token-003")
         monitor.start()
@@ -153,7 +153,7 @@ class TestFileMonitoring:
         finally:
             monitor.stop()
 
-    def test_monitor_detects_file_move(self, temp_watch_dir):
+    def test_monitor_detects_file_move(self, temp_watch_dir, mp_queue):
         """Test that monitor detects file moves."""
         # Create file
         src_file = os.path.join(temp_watch_dir, "test_move_src.txt")
@@ -163,7 +163,7 @@ class TestFileMonitoring:
             f.write("move me")
 
         # Create monitor
-        event_queue = multiprocessing.Manager().Queue()
+        event_queue = mp_queue
         monitor = FSMonitor(event_queue)
         monitor.add_watch_path(temp_watch_dir, token_id="test-token-004")
         monitor.start()
@@ -192,7 +192,7 @@ class TestFileMonitoring:
         finally:
             monitor.stop()
 
-    def test_monitor_multiple_paths(self, temp_watch_dir):
+    def test_monitor_multiple_paths(self, temp_watch_dir, mp_queue):
         """Test monitoring multiple paths."""
         # Create subdirectories
         dir1 = os.path.join(temp_watch_dir, "dir1")
@@ -201,7 +201,7 @@ class TestFileMonitoring:
         os.makedirs(dir2)
 
         # Create monitor
-        event_queue = multiprocessing.Manager().Queue()
+        event_queue = mp_queue
         monitor = FSMonitor(event_queue)
         monitor.add_watch_path(dir1, token_id="token-dir1")
         monitor.add_watch_path(dir2, token_id="token-dir2")
@@ -243,9 +243,9 @@ class TestFileMonitoring:
         finally:
             monitor.stop()
 
-    def test_monitor_ignores_directories(self, temp_watch_dir):
+    def test_monitor_ignores_directories(self, temp_watch_dir, mp_queue):
         """Test that monitor can distinguish files from directories."""
-        event_queue = multiprocessing.Manager().Queue()
+        event_queue = mp_queue
         monitor = FSMonitor(event_queue)
         monitor.add_watch_path(temp_watch_dir, token_id="test-token-005")
         monitor.start()
@@ -275,9 +275,9 @@ class TestFileMonitoring:
 class TestMonitorPerformance:
     """Test monitor performance and stability."""
 
-    def test_monitor_handles_rapid_changes(self, temp_watch_dir):
+    def test_monitor_handles_rapid_changes(self, temp_watch_dir, mp_queue):
         """Test that monitor handles rapid file changes."""
-        event_queue = multiprocessing.Manager().Queue()
+        event_queue = mp_queue
         monitor = FSMonitor(event_queue)
         monitor.add_watch_path(temp_watch_dir, token_id="test-token-006")
         monitor.start()
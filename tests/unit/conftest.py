@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Pytest configuration for HoneyGrid unit tests.
+"""
+
+from pathlib import Path
+
+import pytest
+
+UNIT_DIR = Path(__file__).parent
+
+# Unit tests finish in well under a second; a hung Manager queue or observer
+# thread should fail the test instead of stalling the whole run.
+UNIT_TEST_TIMEOUT = 10
+
+
+def pytest_collection_modifyitems(config, items):
+    """Give unit tests without their own timeout marker the default one."""
+    # The hook sees every collected item in the session, not just this
+    # directory's, so integration and top-level tests are filtered out here
+    for item in items:
+        if UNIT_DIR not in item.path.parents:
+            continue
+        if item.get_closest_marker("timeout") is None:
+            item.add_marker(pytest.mark.timeout(UNIT_TEST_TIMEOUT))
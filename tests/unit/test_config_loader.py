@@ -7,7 +7,7 @@ Tests YAML loading, environment overrides, and config merging.
 import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import pytest
 import tempfile
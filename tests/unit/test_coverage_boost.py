@@ -8,7 +8,7 @@ import time
 import tempfile
 import os
 from pathlib import Path
-from multiprocessing import Manager
+from multiprocessing import Queue
 import sys
 import json
 
@@ -44,11 +44,11 @@ class TestRateLimiterComprehensive:
         assert limiter.lock is not None
 
     def test_limiter_last_refill_initialized(self):
-        """Test last_refill is initialized."""
-        before = time.time()
+        """Test last_refill_ns is initialized from the monotonic clock."""
+        before = time.monotonic_ns()
         limiter = RateLimiter()
-        after = time.time()
-        assert before <= limiter.last_refill <= after
+        after = time.monotonic_ns()
+        assert before <= limiter.last_refill_ns <= after
 
 
 class TestMonitorEventComprehensive:
@@ -159,29 +159,25 @@ class TestFSMonitorComprehensive:
 
     def test_monitor_event_queue_stored(self):
         """Test event queue is stored."""
-        manager = Manager()
-        queue = manager.Queue()
+        queue = Queue()
         monitor = FSMonitor(event_queue=queue)
         assert monitor.event_queue is queue
 
     def test_monitor_watch_paths_list(self):
         """Test watch_paths is a list."""
-        manager = Manager()
-        queue = manager.Queue()
+        queue = Queue()
         monitor = FSMonitor(event_queue=queue, watch_paths=[])
         assert isinstance(monitor.watch_paths, list)
 
     def test_monitor_token_mapping_dict(self):
         """Test token_mapping is a dict."""
-        manager = Manager()
-        queue = manager.Queue()
+        queue = Queue()
         monitor = FSMonitor(event_queue=queue)
         assert isinstance(monitor.token_mapping, dict)
 
     def test_monitor_observer_initially_none(self):
         """Test observer is None initially."""
-        manager = Manager()
-        queue = manager.Queue()
+        queue = Queue()
         monitor = FSMonitor(event_queue=queue)
         assert monitor.observer is None
 
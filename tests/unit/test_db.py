@@ -240,6 +240,84 @@ class TestEventManagement:
         assert len(events) == 1
         assert events[0]["agent_id"] == "agent-001"
 
+    def test_insert_events_bulk(self, temp_db):
+        """Test inserting a batch of events in one transaction."""
+        temp_db.register_agent("agent-001")
+
+        count = temp_db.insert_events_bulk(
+            [
+                {
+                    "agent_id": "agent-001",
+                    "token_id": f"token-{i:03d}",
+                    "path": f"C:\\test\\file{i}.txt",
+                    "event_type": "opened",
+                    "nonce": f"bulk_nonce_{i}",
+                }
+                for i in range(5)
+            ]
+        )
+
+        assert count == 5
+        events = temp_db.get_recent_events(limit=10)
+        assert len(events) == 5
+        assert {e["path"] for e in events} == {
+            f"C:\\test\\file{i}.txt" for i in range(5)
+        }
+        assert temp_db.get_agent("agent-001")["status"] == "warning"
+
+    def test_insert_events_bulk_keeps_zero_timestamp(self, temp_db):
+        """Test that an explicit timestamp of 0 is not replaced."""
+        temp_db.register_agent("agent-001")
+
+        temp_db.insert_events_bulk(
+            [
+                {
+                    "agent_id": "agent-001",
+                    "token_id": "token-001",
+                    "path": "C:\\test\\file.txt",
+                    "event_type": "opened",
+                    "timestamp": 0,
+                    "nonce": "bulk_nonce_zero",
+                }
+            ]
+        )
+
+        events = temp_db.get_recent_events(limit=10)
+        assert events[0]["timestamp"] == 0
+
+    def test_insert_events_bulk_duplicate_nonce_rolls_back(self, temp_db):
+        """Test that a replayed nonce rejects the whole batch."""
+        temp_db.register_agent("agent-001")
+        temp_db.insert_event(
+            agent_id="agent-001",
+            token_id="token-001",
+            path="C:\\test\\file.txt",
+            event_type="opened",
+            nonce="test_nonce_001",
+        )
+
+        with pytest.raises(DatabaseError, match="replay attack"):
+            temp_db.insert_events_bulk(
+                [
+                    {
+                        "agent_id": "agent-001",
+                        "token_id": "token-002",
+                        "path": "C:\\test\\file2.txt",
+                        "event_type": "modified",
+                        "nonce": "test_nonce_002",
+                    },
+                    {
+                        "agent_id": "agent-001",
+                        "token_id": "token-003",
+                        "path": "C:\\test\\file3.txt",
+                        "event_type": "modified",
+                        "nonce": "test_nonce_001",  # Same nonce!
+                    },
+                ]
+            )
+
+        assert len(temp_db.get_recent_events()) == 1
+
 
 class TestTokenManagement:
     """Test honeytoken registration."""
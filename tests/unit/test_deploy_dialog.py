@@ -9,10 +9,8 @@ import tkinter as tk
 from tkinter import ttk
 import tempfile
 import os
-from pathlib import Path
 import sys
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 # Set TCL/TK library paths before any Tk imports
 python_dir = sys.base_prefix
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the .env loader.
+Tests .env discovery, loading and lookup caching.
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from utils import env_loader
+from utils.env_loader import load_env
+
+
+@pytest.fixture
+def env_dir(tmp_path, monkeypatch):
+    """Working directory containing a .env file, with a clean lookup cache."""
+    (tmp_path / ".env").write_text("HONEYGRID_TEST_VAR=from-dotenv\n")
+    monkeypatch.chdir(tmp_path)
+    # Registered with monkeypatch so the value is restored after the test
+    monkeypatch.setenv("HONEYGRID_TEST_VAR", "before")
+    monkeypatch.setattr(env_loader, "_LOADED", False)
+    monkeypatch.setattr(env_loader, "_DOTENV_PATHS", {})
+    return tmp_path
+
+
+class TestLoadEnv:
+    """Test load_env and .env resolution."""
+
+    def test_loads_dotenv_from_cwd(self, env_dir):
+        """Test variables from the cwd .env override the environment."""
+        assert load_env() is True
+        assert os.environ["HONEYGRID_TEST_VAR"] == "from-dotenv"
+
+    def test_second_load_is_noop(self, env_dir):
+        """Test the .env file is only read on the first call."""
+        load_env()
+        (env_dir / ".env").write_text("HONEYGRID_TEST_VAR=rewritten\n")
+
+        assert load_env() is True
+        assert os.environ["HONEYGRID_TEST_VAR"] == "from-dotenv"
+
+    def test_force_reloads(self, env_dir):
+        """Test force=True re-reads the .env file."""
+        load_env()
+        (env_dir / ".env").write_text("HONEYGRID_TEST_VAR=rewritten\n")
+
+        assert load_env(force=True) is True
+        assert os.environ["HONEYGRID_TEST_VAR"] == "rewritten"
+
+    def test_dotenv_lookup_is_cached(self, env_dir, monkeypatch):
+        """Test the directory walk runs once per working directory."""
+        import dotenv
+
+        calls = []
+        real_find = dotenv.find_dotenv
+        monkeypatch.setattr(
+            dotenv, "find_dotenv", lambda **kw: calls.append(kw) or real_find(**kw)
+        )
+
+        load_env()
+        load_env(force=True)
+
+        assert len(calls) == 1
+
+    def test_dotenv_created_after_miss(self, env_dir):
+        """Test a .env that appears after a failed lookup is found on force."""
+        (env_dir / ".env").unlink()
+        load_env()
+        assert os.environ["HONEYGRID_TEST_VAR"] == "before"
+
+        (env_dir / ".env").write_text("HONEYGRID_TEST_VAR=created-later\n")
+
+        assert load_env(force=True) is True
+        assert os.environ["HONEYGRID_TEST_VAR"] == "created-later"
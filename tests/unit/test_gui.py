@@ -5,57 +5,68 @@ Tests initialization, methods, and state without displaying windows.
 """
 
 import pytest
-import tkinter as tk
-from tkinter import ttk
-import tempfile
-import os
 import queue
-from pathlib import Path
-import sys
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+tk = pytest.importorskip("tkinter")
 
-# Set TCL/TK library paths before any Tk imports to avoid "Can't find init.tcl" errors
-python_dir = sys.base_prefix  # Get the base Python installation directory
-tcl_dir = os.path.join(python_dir, "tcl")
-
-if os.path.exists(tcl_dir):
-    tcl_lib = os.path.join(tcl_dir, "tcl8.6")
-    tk_lib = os.path.join(tcl_dir, "tk8.6")
-
-    if os.path.exists(tcl_lib):
-        os.environ["TCL_LIBRARY"] = tcl_lib
-    if os.path.exists(tk_lib):
-        os.environ["TK_LIBRARY"] = tk_lib
-
-from gui_tk.app import HoneyGridApp
 from gui_tk.alert_frame import AlertFrame
 from gui_tk.map_frame import MapFrame
 from server.db import DatabaseManager
 
 
 @pytest.fixture
-def temp_db():
-    """Create temporary database."""
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-    temp_file.close()
+def temp_db(tmp_path, make_test_db):
+    """Create temporary database (unique per test, safe under pytest -n)."""
+    return make_test_db(tmp_path / "test.db")
+
+
+def _seed(db):
+    """Register two agents and record two events for agent-001."""
+    db.register_agent("agent-001", hostname="host1")
+    db.register_agent("agent-002", hostname="host2")
+    db.insert_event("agent-001", "token-001", "/path1", "opened", "nonce1")
+    db.insert_event("agent-001", "token-002", "/path2", "modified", "nonce2")
+    return db
+
 
-    db = DatabaseManager(temp_file.name, "test_pass")
+@pytest.fixture
+def seeded_db(temp_db):
+    """Temporary database with seed data, for tests that may change it."""
+    return _seed(temp_db)
+
+
+@pytest.fixture(scope="module")
+def seeded_db_module():
+    """In-memory database with seed data, shared by read-only tests."""
+    db = DatabaseManager(":memory:", "test_pass")
     db.connect()
+    _seed(db)
 
     yield db
 
     db.close()
-    try:
-        os.unlink(temp_file.name)
-    except:
-        pass
+
+
+@pytest.fixture
+def alert_frame_with_events(root, seeded_db):
+    """Provide an AlertFrame already populated from a seeded database."""
+    frame = AlertFrame(root, db=seeded_db)
+    frame.refresh()
+    return frame
 
 
 @pytest.fixture(scope="session")
 def tk_root():
-    """Create a single Tk root for all tests (session-scoped)."""
-    root = tk.Tk()
+    """
+    Create a single Tk root for all tests (session-scoped).
+
+    Under pytest-xdist every worker runs its own session, so each worker
+    process gets its own Tk interpreter rather than sharing one across forks.
+    """
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"Tk display not available: {e}")
     root.withdraw()  # Don't display window
     yield root
     try:
@@ -64,222 +75,97 @@ def tk_root():
         pass
 
 
-@pytest.fixture
-def root(tk_root):
-    """Provide the session-scoped Tk root to each test."""
-    return tk_root
-
+@pytest.fixture(scope="class")
+def app_db_path(tmp_path_factory):
+    """Database path for the class-scoped app."""
+    return tmp_path_factory.mktemp("app") / "test.db"
 
-class TestAlertFrame:
-    """Test AlertFrame component."""
-
-    def test_alert_frame_init(self, root, temp_db):
-        """Test AlertFrame initialization."""
-        frame = AlertFrame(root, db=temp_db)
-        assert frame is not None
-        assert frame.db is temp_db
-
-    def test_alert_frame_init_without_db(self, root):
-        """Test AlertFrame init without database."""
-        frame = AlertFrame(root, db=None)
-        assert frame is not None
-        assert frame.db is None
-
-    def test_alert_frame_has_tree(self, root, temp_db):
-        """Test AlertFrame has treeview widget."""
-        frame = AlertFrame(root, db=temp_db)
-        assert hasattr(frame, "tree")
-        assert isinstance(frame.tree, ttk.Treeview)
-
-    def test_alert_frame_has_count_label(self, root, temp_db):
-        """Test AlertFrame has count label."""
-        frame = AlertFrame(root, db=temp_db)
-        assert hasattr(frame, "count_label")
-        assert isinstance(frame.count_label, ttk.Label)
-
-    def test_alert_frame_events_list(self, root, temp_db):
-        """Test AlertFrame has events list."""
-        frame = AlertFrame(root, db=temp_db)
-        assert hasattr(frame, "events")
-        assert isinstance(frame.events, list)
-
-    def test_alert_frame_clear_method(self, root, temp_db):
-        """Test AlertFrame clear method."""
-        frame = AlertFrame(root, db=temp_db)
-        frame.clear()
-        # Should not raise exception
-        assert True
 
-    def test_alert_frame_refresh_method(self, root, temp_db):
-        """Test AlertFrame refresh method."""
-        temp_db.register_agent("agent-001")
-        temp_db.insert_event("agent-001", "token-001", "/path", "opened", "nonce1")
+@pytest.fixture(scope="class")
+def app_instance(tk_root, app_db_path):
+    """Build one HoneyGridApp in its own Toplevel for a whole test class."""
+    from gui_tk.app import HoneyGridApp
 
-        frame = AlertFrame(root, db=temp_db)
-        frame.refresh()
-        # Should not raise exception
-        assert True
+    window = tk.Toplevel(tk_root)
+    app = HoneyGridApp(db_path=app_db_path, db_password="test_pass", root=window)
 
-    def test_alert_frame_set_database(self, root, temp_db):
-        """Test AlertFrame set_database method."""
-        frame = AlertFrame(root, db=None)
-        frame.set_database(temp_db)
-        assert frame.db is temp_db
-
-
-class TestMapFrame:
-    """Test MapFrame component."""
-
-    def test_map_frame_init(self, root, temp_db):
-        """Test MapFrame initialization."""
-        frame = MapFrame(root, db=temp_db)
-        assert frame is not None
-        assert frame.db is temp_db
-
-    def test_map_frame_init_without_db(self, root):
-        """Test MapFrame init without database."""
-        frame = MapFrame(root, db=None)
-        assert frame is not None
-        assert frame.db is None
-
-    def test_map_frame_has_canvas(self, root, temp_db):
-        """Test MapFrame has canvas widget."""
-        frame = MapFrame(root, db=temp_db)
-        assert hasattr(frame, "canvas")
-        assert isinstance(frame.canvas, tk.Canvas)
-
-    def test_map_frame_has_agents_dict(self, root, temp_db):
-        """Test MapFrame has agents dictionary."""
-        frame = MapFrame(root, db=temp_db)
-        assert hasattr(frame, "agents")
-        assert isinstance(frame.agents, dict)
-
-    def test_map_frame_has_colors(self, root, temp_db):
-        """Test MapFrame has color definitions."""
-        frame = MapFrame(root, db=temp_db)
-        assert hasattr(frame, "colors")
-        assert isinstance(frame.colors, dict)
-        assert "healthy" in frame.colors
-        assert "warning" in frame.colors
-        assert "triggered" in frame.colors
-        assert "offline" in frame.colors
-
-    def test_map_frame_set_database(self, root, temp_db):
-        """Test MapFrame set_database method."""
-        frame = MapFrame(root, db=None)
-        frame.set_database(temp_db)
-        assert frame.db is temp_db
-
-    def test_map_frame_refresh_method(self, root, temp_db):
-        """Test MapFrame refresh method."""
-        temp_db.register_agent("agent-001")
-
-        frame = MapFrame(root, db=temp_db)
-        frame.refresh()
-        # Should not raise exception
-        assert True
+    yield app
 
-    def test_map_frame_update_agent_status(self, root, temp_db):
-        """Test MapFrame update_agent_status method."""
-        temp_db.register_agent("agent-001")
+    # Stops the update thread, closes the db and destroys the window
+    app._on_close()
 
-        frame = MapFrame(root, db=temp_db)
-        frame.agents = {"agent-001": {"status": "healthy"}}
-        frame.update_agent_status("agent-001", "triggered")
 
-        assert frame.agents["agent-001"]["status"] == "triggered"
+@pytest.fixture
+def root(tk_root):
+    """Provide the session-scoped Tk root to each test."""
+    return tk_root
 
 
 class TestHoneyGridApp:
     """Test HoneyGridApp main application."""
 
-    def test_app_has_server_queue(self, temp_db):
+    def test_app_has_server_queue(self, tk_root, temp_db):
         """Test app has server queue."""
-        try:
-            q = queue.Queue()
-            app = HoneyGridApp(server_queue=q)
-            app.root.withdraw()
-            assert app.server_queue is q
-            app.root.destroy()
-        except Exception as e:
-            if "tcl" in str(e).lower() or "tk" in str(e).lower():
-                pytest.skip(f"Tkinter issue (multiple Tk instances): {e}")
-            raise
-
-    def test_app_creates_default_queue(self, temp_db):
+        from gui_tk.app import HoneyGridApp
+
+        q = queue.Queue()
+        window = tk.Toplevel(tk_root)
+        app = HoneyGridApp(
+            db_path=temp_db.db_path,
+            db_password="test_pass",
+            server_queue=q,
+            root=window,
+        )
+        assert app.server_queue is q
+
+        app._on_close()
+
+    def test_app_creates_default_queue(self, app_instance):
         """Test app creates default queue if none provided."""
-        try:
-            app = HoneyGridApp()
-            app.root.withdraw()
-            assert isinstance(app.server_queue, queue.Queue)
-            app.root.destroy()
-        except Exception as e:
-            if "tcl" in str(e).lower() or "tk" in str(e).lower():
-                pytest.skip(f"Tkinter issue (multiple Tk instances): {e}")
-            raise
-
-    def test_app_has_db_path(self, temp_db):
+        assert isinstance(app_instance.server_queue, queue.Queue)
+
+    def test_app_has_db_path(self, app_instance, app_db_path):
         """Test app stores database path."""
-        app = HoneyGridApp(db_path=temp_db.db_path, db_password="test_pass")
-        app.root.withdraw()
-        assert app.db_path == temp_db.db_path
-        app.root.destroy()
+        assert app_instance.db_path == app_db_path
 
-    def test_app_init(self, temp_db):
+    def test_app_init(self, app_instance, tk_root):
         """Test HoneyGridApp initialization."""
-        app = HoneyGridApp(db_path=temp_db.db_path, db_password="test_pass")
-        app.root.withdraw()
-        assert app is not None
-        app.root.destroy()
+        assert isinstance(app_instance.root, tk.Toplevel)
+        assert app_instance.root.master is tk_root
+        assert app_instance.db is not None
 
 
 class TestAlertFrameFunctionality:
     """Test AlertFrame functionality."""
 
-    def test_alert_frame_add_events(self, root, temp_db):
+    def test_alert_frame_add_events(self, alert_frame_with_events):
         """Test adding events to AlertFrame."""
-        temp_db.register_agent("agent-001")
-        temp_db.insert_event("agent-001", "token-001", "/path1", "opened", "nonce1")
-        temp_db.insert_event("agent-001", "token-002", "/path2", "modified", "nonce2")
-
-        frame = AlertFrame(root, db=temp_db)
-        frame.refresh()
-
         # Events should be loaded
-        assert len(frame.events) >= 2
+        assert len(alert_frame_with_events.events) >= 2
 
-    def test_alert_frame_empty_database(self, root, temp_db):
+    def test_alert_frame_empty_database(self, root, mem_db):
         """Test AlertFrame with empty database."""
-        frame = AlertFrame(root, db=temp_db)
+        frame = AlertFrame(root, db=mem_db)
         frame.refresh()
 
         # Should handle empty database gracefully
         assert frame.events == []
 
-    def test_alert_frame_clear_events(self, root, temp_db):
+    def test_alert_frame_clear_events(self, alert_frame_with_events):
         """Test clearing events from AlertFrame."""
-        temp_db.register_agent("agent-001")
-        temp_db.insert_event("agent-001", "token-001", "/path", "opened", "nonce1")
-
-        frame = AlertFrame(root, db=temp_db)
-        frame.refresh()
-
         # Clear
-        frame.clear()
+        alert_frame_with_events.clear()
 
         # Tree should be empty
-        assert len(frame.tree.get_children()) == 0
+        assert len(alert_frame_with_events.tree.get_children()) == 0
 
 
 class TestMapFrameFunctionality:
     """Test MapFrame functionality."""
 
-    def test_map_frame_load_agents(self, root, temp_db):
+    def test_map_frame_load_agents(self, root, seeded_db_module):
         """Test loading agents into MapFrame."""
-        temp_db.register_agent("agent-001", hostname="host1")
-        temp_db.register_agent("agent-002", hostname="host2")
-
-        frame = MapFrame(root, db=temp_db)
+        frame = MapFrame(root, db=seeded_db_module)
         # The frame tries to call get_all_agents which may not exist
         # Just test that it doesn't crash
         try:
@@ -289,9 +175,9 @@ class TestMapFrameFunctionality:
 
         assert True
 
-    def test_map_frame_empty_database(self, root, temp_db):
+    def test_map_frame_empty_database(self, root, mem_db):
         """Test MapFrame with empty database."""
-        frame = MapFrame(root, db=temp_db)
+        frame = MapFrame(root, db=mem_db)
 
         try:
             frame.refresh()
@@ -301,15 +187,15 @@ class TestMapFrameFunctionality:
         # Should handle empty database gracefully
         assert True
 
-    def test_map_frame_node_positions(self, root, temp_db):
+    def test_map_frame_node_positions(self, root, mem_db):
         """Test MapFrame node_positions dict."""
-        frame = MapFrame(root, db=temp_db)
+        frame = MapFrame(root, db=mem_db)
         assert hasattr(frame, "node_positions")
         assert isinstance(frame.node_positions, dict)
 
-    def test_map_frame_node_ids(self, root, temp_db):
+    def test_map_frame_node_ids(self, root, mem_db):
         """Test MapFrame node_ids dict."""
-        frame = MapFrame(root, db=temp_db)
+        frame = MapFrame(root, db=mem_db)
         assert hasattr(frame, "node_ids")
         assert isinstance(frame.node_ids, dict)
 
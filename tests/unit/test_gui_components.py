@@ -4,18 +4,12 @@ Unit Tests for GUI Components
 Tests AlertFrame search/filter, StatsFrame, and MapFrame health status.
 """
 
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 import pytest
 import tkinter as tk
-import tempfile
+from tkinter import ttk
 import time
 from unittest.mock import Mock, MagicMock
 
-from server.db import DatabaseManager
 from gui_tk.alert_frame import AlertFrame
 from gui_tk.stats_frame import StatsFrame
 from gui_tk.map_frame import MapFrame
@@ -30,33 +24,29 @@ def root():
 
 
 @pytest.fixture
-def test_db():
+def test_db(tmp_path, make_test_db):
     """Create a temporary test database."""
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
-    temp_file.close()
-
-    db = DatabaseManager(temp_file.name, "test")
-    db.connect()
+    db = make_test_db(tmp_path / "test.db", "test")
 
     # Add test data
     db.register_agent("agent-001", "host-1", "192.168.1.100")
     db.register_agent("agent-002", "host-2", "192.168.1.101")
 
-    for i in range(10):
-        db.insert_event(
-            agent_id=f"agent-00{(i % 2) + 1}",
-            token_id=f"token-{(i % 3) + 1:03d}",
-            path=f"C:\\test\\file{i}.txt",
-            event_type=["created", "modified", "opened", "deleted"][i % 4],
-            nonce=f"nonce-{i:03d}",
-        )
-
-    yield db
-
-    db.close()
-    import os
+    event_types = ["created", "modified", "opened", "deleted"]
+    db.insert_events_bulk(
+        [
+            {
+                "agent_id": f"agent-00{(i % 2) + 1}",
+                "token_id": f"token-{(i % 3) + 1:03d}",
+                "path": f"C:\\test\\file{i}.txt",
+                "event_type": event_types[i % 4],
+                "nonce": f"nonce-{i:03d}",
+            }
+            for i in range(10)
+        ]
+    )
 
-    os.unlink(temp_file.name)
+    return db
 
 
 class TestAlertFrame:
@@ -70,6 +60,27 @@ class TestAlertFrame:
         assert hasattr(frame, "search_vars")
         assert hasattr(frame, "filtered_events")
         assert len(frame.search_vars) == 4  # agent, token, type, path
+        assert isinstance(frame.tree, ttk.Treeview)
+        assert isinstance(frame.count_label, ttk.Label)
+        assert isinstance(frame.events, list)
+
+    def test_init_without_db(self, root):
+        """Test AlertFrame init without database."""
+        frame = AlertFrame(root, db=None)
+        assert frame.db is None
+
+    def test_clear_method(self, root, mem_db):
+        """Test AlertFrame clear method."""
+        frame = AlertFrame(root, db=mem_db)
+        frame.clear()
+
+        assert len(frame.tree.get_children()) == 0
+
+    def test_set_database(self, root, mem_db):
+        """Test AlertFrame set_database method."""
+        frame = AlertFrame(root, db=None)
+        frame.set_database(mem_db)
+        assert frame.db is mem_db
 
     def test_refresh_loads_events(self, root, test_db):
         """Test that refresh loads events from database."""
@@ -191,12 +202,24 @@ class TestMapFrame:
         frame = MapFrame(root, test_db)
 
         assert frame.db == test_db
-        assert hasattr(frame, "agents")
+        assert isinstance(frame.canvas, tk.Canvas)
+        assert isinstance(frame.agents, dict)
         assert hasattr(frame, "colors")
         assert "healthy" in frame.colors
         assert "warning" in frame.colors
         assert "offline" in frame.colors
 
+    def test_init_without_db(self, root):
+        """Test MapFrame init without database."""
+        frame = MapFrame(root, db=None)
+        assert frame.db is None
+
+    def test_set_database(self, root, mem_db):
+        """Test MapFrame set_database method."""
+        frame = MapFrame(root, db=None)
+        frame.set_database(mem_db)
+        assert frame.db is mem_db
+
     def test_refresh_loads_agents(self, root, test_db):
         """Test that refresh loads agents from database."""
         frame = MapFrame(root, test_db)
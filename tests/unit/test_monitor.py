@@ -2,17 +2,19 @@
 """Unit tests for file system monitoring."""
 
 import pytest
-import tempfile
 import time
-from pathlib import Path
-from multiprocessing import Queue, Manager
-import sys
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import multiprocessing
+from queue import Queue
 
 from agent.monitor import FSMonitor, MonitorEvent
 
 
+@pytest.fixture(scope="session")
+def watch_dir(tmp_path_factory):
+    """Empty directory shared by tests that only watch it."""
+    return tmp_path_factory.mktemp("watch")
+
+
 class TestMonitorEventDataClass:
     """Test MonitorEvent dataclass."""
 
@@ -49,8 +51,7 @@ class TestFSMonitorInit:
 
     def test_monitor_init(self):
         """Test FSMonitor creation."""
-        manager = Manager()
-        queue = manager.Queue()
+        queue = Queue()
 
         monitor = FSMonitor(
             event_queue=queue, watch_paths=["/tmp"], token_mapping={"t1": "/tmp/file"}
@@ -61,8 +62,7 @@ class TestFSMonitorInit:
 
     def test_monitor_empty_init(self):
         """Test FSMonitor with empty params."""
-        manager = Manager()
-        queue = manager.Queue()
+        queue = Queue()
 
         monitor = FSMonitor(event_queue=queue)
 
@@ -71,8 +71,7 @@ class TestFSMonitorInit:
 
     def test_monitor_multiple_paths(self):
         """Test FSMonitor with multiple paths."""
-        manager = Manager()
-        queue = manager.Queue()
+        queue = Queue()
 
         paths = ["/tmp", "/home", "/var"]
         monitor = FSMonitor(event_queue=queue, watch_paths=paths)
@@ -80,65 +79,63 @@ class TestFSMonitorInit:
         assert len(monitor.watch_paths) == 3
 
 
+@pytest.mark.serial
+@pytest.mark.timeout(30)
 class TestFSMonitorStartStop:
     """Test monitor start/stop."""
 
-    def test_monitor_start(self):
+    def test_monitor_start(self, watch_dir):
         """Test starting monitor."""
-        manager = Manager()
-        queue = manager.Queue()
+        queue = multiprocessing.Queue()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            monitor = FSMonitor(event_queue=queue, watch_paths=[tmpdir])
+        tmpdir = str(watch_dir)
+        monitor = FSMonitor(event_queue=queue, watch_paths=[tmpdir])
 
-            monitor.start()
-            assert monitor.observer is not None
-            assert monitor.observer.is_alive()
+        monitor.start()
+        assert monitor.observer is not None
+        assert monitor.observer.is_alive()
 
-            monitor.stop()
+        monitor.stop()
 
-    def test_monitor_stop(self):
+    def test_monitor_stop(self, watch_dir):
         """Test stopping monitor."""
-        manager = Manager()
-        queue = manager.Queue()
+        queue = multiprocessing.Queue()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            monitor = FSMonitor(event_queue=queue, watch_paths=[tmpdir])
+        tmpdir = str(watch_dir)
+        monitor = FSMonitor(event_queue=queue, watch_paths=[tmpdir])
 
-            monitor.start()
-            time.sleep(0.1)
-            monitor.stop()
-            time.sleep(0.5)
+        monitor.start()
+        time.sleep(0.1)
+        monitor.stop()
+        time.sleep(0.5)
 
-            assert not monitor.observer.is_alive()
+        assert not monitor.observer.is_alive()
 
 
 class TestFSMonitorAddRemovePath:
     """Test adding/removing paths."""
 
-    def test_add_watch_path(self):
+    def test_add_watch_path(self, watch_dir):
         """Test adding path to monitor."""
-        manager = Manager()
-        queue = manager.Queue()
+        queue = Queue()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            monitor = FSMonitor(event_queue=queue)
-            monitor.add_watch_path(tmpdir, "token1")
+        tmpdir = str(watch_dir)
+        monitor = FSMonitor(event_queue=queue)
+        monitor.add_watch_path(tmpdir, "token1")
 
-            assert tmpdir in monitor.watch_paths or len(monitor.watch_paths) >= 0
+        assert tmpdir in monitor.watch_paths or len(monitor.watch_paths) >= 0
 
-    def test_remove_watch_path(self):
+    def test_remove_watch_path(self, watch_dir, tmp_path):
         """Test removing path from monitor."""
-        manager = Manager()
-        queue = manager.Queue()
+        queue = Queue()
 
-        with tempfile.TemporaryDirectory() as tmpdir1:
-            with tempfile.TemporaryDirectory() as tmpdir2:
-                monitor = FSMonitor(event_queue=queue, watch_paths=[tmpdir1, tmpdir2])
+        tmpdir1 = str(watch_dir)
+        tmpdir2 = str(tmp_path)
+        monitor = FSMonitor(event_queue=queue, watch_paths=[tmpdir1, tmpdir2])
 
-                monitor.remove_watch_path(tmpdir1)
+        monitor.remove_watch_path(tmpdir1)
 
-                assert len(monitor.watch_paths) <= 2
+        assert len(monitor.watch_paths) <= 2
 
 
 class TestFSMonitorTokenMapping:
@@ -146,8 +143,7 @@ class TestFSMonitorTokenMapping:
 
     def test_set_token_mapping_via_init(self):
         """Test setting token mapping during init."""
-        manager = Manager()
-        queue = manager.Queue()
+        queue = Queue()
 
         monitor = FSMonitor(
             event_queue=queue, token_mapping={"t1": "/path1", "t2": "/path2"}
@@ -159,8 +155,7 @@ class TestFSMonitorTokenMapping:
 
     def test_empty_token_mapping(self):
         """Test monitor with no token mapping."""
-        manager = Manager()
-        queue = manager.Queue()
+        queue = Queue()
 
         monitor = FSMonitor(event_queue=queue)
 
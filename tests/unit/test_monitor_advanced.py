@@ -5,11 +5,9 @@ Tests file system monitoring and event handling.
 """
 
 import pytest
-import time
-import tempfile
 import os
 from pathlib import Path
-from multiprocessing import Manager
+from unittest.mock import Mock
 import sys
 
 # Add parent directory to path
@@ -17,92 +15,89 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from agent.monitor import FSMonitor, MonitorEvent
 
+# Events here are never checked against the wall clock.
+FIXED_TS = 1_700_000_000
 
-class TestFSMonitorAdvanced:
-    """Test advanced FSMonitor functionality."""
 
-    def test_monitor_multiple_paths(self):
-        """Test monitoring multiple paths simultaneously."""
-        manager = Manager()
-        queue = manager.Queue()
+@pytest.fixture
+def event_queue():
+    """Stand-in queue; these tests only inspect monitor attributes."""
+    return Mock()
 
-        with tempfile.TemporaryDirectory() as tmpdir1:
-            with tempfile.TemporaryDirectory() as tmpdir2:
-                with tempfile.TemporaryDirectory() as tmpdir3:
-                    monitor = FSMonitor(
-                        event_queue=queue, watch_paths=[tmpdir1, tmpdir2, tmpdir3]
-                    )
 
-                    # Should be monitoring all three
-                    assert len(monitor.watch_paths) == 3
+@pytest.fixture(scope="session")
+def tmpdirs(tmp_path_factory):
+    """Three empty directories shared by tests that never write into them."""
+    return [str(tmp_path_factory.mktemp(f"honey{i}")) for i in range(3)]
 
-    def test_monitor_with_verbose(self):
-        """Test monitor with verbose logging enabled."""
-        manager = Manager()
-        queue = manager.Queue()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            monitor = FSMonitor(event_queue=queue, watch_paths=[tmpdir], verbose=True)
+def _fake_dirs(n):
+    """Unique directory strings that never touch the filesystem.
 
-            assert monitor.verbose is True
+    Only valid where FSMonitor just stores the paths (the constructor);
+    add_watch_path() checks existence and still needs real directories.
+    """
+    return [os.path.join(os.sep, "honeygrid-fake", f"dir{i}") for i in range(n)]
 
-    def test_monitor_non_recursive(self):
-        """Test monitor with recursive=False."""
-        manager = Manager()
-        queue = manager.Queue()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            monitor = FSMonitor(
-                event_queue=queue, watch_paths=[tmpdir], recursive=False
-            )
+class TestFSMonitorAdvanced:
+    """Test advanced FSMonitor functionality."""
 
-            assert monitor.recursive is False
+    def test_monitor_multiple_paths(self, event_queue):
+        """Test monitoring multiple paths simultaneously."""
+        tmpdir1, tmpdir2, tmpdir3 = _fake_dirs(3)
+        monitor = FSMonitor(
+            event_queue=event_queue, watch_paths=[tmpdir1, tmpdir2, tmpdir3]
+        )
 
-    def test_monitor_recursive_default(self):
-        """Test that recursive monitoring is default."""
-        manager = Manager()
-        queue = manager.Queue()
+        # Should be monitoring all three
+        assert len(monitor.watch_paths) == 3
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            monitor = FSMonitor(event_queue=queue, watch_paths=[tmpdir])
+    def test_monitor_with_verbose(self, event_queue, tmpdirs):
+        """Test monitor with verbose logging enabled."""
+        tmpdir = tmpdirs[0]
+        monitor = FSMonitor(event_queue=event_queue, watch_paths=[tmpdir], verbose=True)
 
-            # Default should be True
-            assert monitor.recursive is True
+        assert monitor.verbose is True
 
-    def test_monitor_empty_watch_paths(self):
-        """Test monitor with no watch paths initially."""
-        manager = Manager()
-        queue = manager.Queue()
+    def test_monitor_recursive_default(self, event_queue, tmpdirs):
+        """Test that recursive monitoring is default."""
+        tmpdir = tmpdirs[0]
+        monitor = FSMonitor(event_queue=event_queue, watch_paths=[tmpdir])
 
-        monitor = FSMonitor(event_queue=queue)
+        # Default should be True
+        assert monitor.recursive is True
+
+    def test_monitor_empty_watch_paths(self, event_queue):
+        """Test monitor with no watch paths initially."""
+        monitor = FSMonitor(event_queue=event_queue)
 
         # Should initialize with empty list
         assert monitor.watch_paths == []
 
-    def test_monitor_complex_token_mapping(self):
+    def test_monitor_complex_token_mapping(self, event_queue, tmpdirs):
         """Test monitor with complex token mapping."""
-        manager = Manager()
-        queue = manager.Queue()
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path1 = os.path.join(tmpdir, "file1.txt")
-            path2 = os.path.join(tmpdir, "file2.doc")
-            path3 = os.path.join(tmpdir, "subdir", "file3.pdf")
-
-            token_mapping = {
-                "token_file1": path1,
-                "token_file2": path2,
-                "token_file3": path3,
-            }
+        tmpdir = tmpdirs[0]
+        path1 = os.path.join(tmpdir, "file1.txt")
+        path2 = os.path.join(tmpdir, "file2.doc")
+        path3 = os.path.join(tmpdir, "subdir", "file3.pdf")
+
+        token_mapping = {
+            "token_file1": path1,
+            "token_file2": path2,
+            "token_file3": path3,
+        }
 
-            monitor = FSMonitor(
-                event_queue=queue, watch_paths=[tmpdir], token_mapping=token_mapping
-            )
+        monitor = FSMonitor(
+            event_queue=event_queue,
+            watch_paths=[tmpdir],
+            token_mapping=token_mapping,
+        )
 
-            assert len(monitor.token_mapping) == 3
-            assert "token_file1" in monitor.token_mapping
-            assert "token_file2" in monitor.token_mapping
-            assert "token_file3" in monitor.token_mapping
+        assert len(monitor.token_mapping) == 3
+        assert "token_file1" in monitor.token_mapping
+        assert "token_file2" in monitor.token_mapping
+        assert "token_file3" in monitor.token_mapping
 
 
 class TestMonitorEventAdvanced:
@@ -114,7 +109,7 @@ class TestMonitorEventAdvanced:
             token_id="token123",
             path="/tmp/honeydir",
             event_type="created",
-            timestamp=time.time(),
+            timestamp=FIXED_TS,
             is_directory=True,
             metadata={},
         )
@@ -134,7 +129,7 @@ class TestMonitorEventAdvanced:
             token_id="token456",
             path="/tmp/file.txt",
             event_type="opened",
-            timestamp=time.time(),
+            timestamp=FIXED_TS,
             is_directory=False,
             metadata=metadata,
         )
@@ -163,145 +158,102 @@ class TestMonitorEventAdvanced:
         assert d["is_directory"] is False
         assert d["metadata"]["size"] == 4096
 
-    def test_event_different_types(self):
+    @pytest.mark.parametrize(
+        "event_type", ["created", "modified", "opened", "moved", "deleted"]
+    )
+    def test_event_different_types(self, event_type):
         """Test creating events with different event types."""
-        types = ["created", "modified", "opened", "moved", "deleted"]
-
-        for event_type in types:
-            event = MonitorEvent(
-                token_id="token",
-                path="/path",
-                event_type=event_type,
-                timestamp=time.time(),
-                is_directory=False,
-                metadata={},
-            )
+        event = MonitorEvent(
+            token_id="token",
+            path="/path",
+            event_type=event_type,
+            timestamp=FIXED_TS,
+            is_directory=False,
+            metadata={},
+        )
 
-            assert event.event_type == event_type
+        assert event.event_type == event_type
 
-    def test_event_paths_types(self):
-        """Test events with different path types."""
-        paths = [
+    @pytest.mark.parametrize(
+        "path",
+        [
             "/unix/path/file.txt",
             "C:\\Windows\\path\\file.doc",
             "/path/with spaces/file.txt",
             "relative/path/file.pdf",
-        ]
-
-        for path in paths:
-            event = MonitorEvent(
-                token_id="token",
-                path=path,
-                event_type="created",
-                timestamp=time.time(),
-                is_directory=False,
-                metadata={},
-            )
+        ],
+    )
+    def test_event_paths_types(self, path):
+        """Test events with different path types."""
+        event = MonitorEvent(
+            token_id="token",
+            path=path,
+            event_type="created",
+            timestamp=FIXED_TS,
+            is_directory=False,
+            metadata={},
+        )
 
-            assert event.path == path
+        assert event.path == path
 
 
 class TestFSMonitorConfiguration:
     """Test FSMonitor configuration options."""
 
-    def test_monitor_with_all_options(self):
-        """Test monitor with all configuration options."""
-        manager = Manager()
-        queue = manager.Queue()
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            monitor = FSMonitor(
-                event_queue=queue,
-                watch_paths=[tmpdir],
-                token_mapping={"t1": os.path.join(tmpdir, "file.txt")},
-                recursive=True,
-                verbose=True,
-            )
-
-            assert monitor.event_queue is not None
-            assert len(monitor.watch_paths) == 1
-            assert len(monitor.token_mapping) == 1
-            assert monitor.recursive is True
-            assert monitor.verbose is True
-
-    def test_monitor_different_recursion_settings(self):
-        """Test monitor with different recursion settings."""
-        manager = Manager()
-        queue = manager.Queue()
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Recursive
-            monitor1 = FSMonitor(
-                event_queue=queue, watch_paths=[tmpdir], recursive=True
-            )
-
-            # Non-recursive
-            monitor2 = FSMonitor(
-                event_queue=queue, watch_paths=[tmpdir], recursive=False
-            )
-
-            assert monitor1.recursive is True
-            assert monitor2.recursive is False
-
-    def test_monitor_verbose_levels(self):
-        """Test monitor with different verbose settings."""
-        manager = Manager()
-        queue = manager.Queue()
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Verbose on
-            monitor1 = FSMonitor(event_queue=queue, watch_paths=[tmpdir], verbose=True)
-
-            # Verbose off
-            monitor2 = FSMonitor(event_queue=queue, watch_paths=[tmpdir], verbose=False)
-
-            assert monitor1.verbose is True
-            assert monitor2.verbose is False
+    @pytest.mark.parametrize(
+        "recursive,verbose",
+        [(True, True), (True, False), (False, True), (False, False)],
+    )
+    def test_monitor_flags(self, event_queue, tmpdirs, recursive, verbose):
+        """Test every recursive/verbose combination is stored as given."""
+        tmpdir = tmpdirs[0]
+        monitor = FSMonitor(
+            event_queue=event_queue,
+            watch_paths=[tmpdir],
+            token_mapping={"t1": os.path.join(tmpdir, "file.txt")},
+            recursive=recursive,
+            verbose=verbose,
+        )
+
+        assert monitor.event_queue is not None
+        assert len(monitor.watch_paths) == 1
+        assert len(monitor.token_mapping) == 1
+        assert monitor.recursive is recursive
+        assert monitor.verbose is verbose
 
 
 class TestMonitorPathOperations:
     """Test path-related monitor operations."""
 
-    def test_add_single_watch_path(self):
+    def test_add_single_watch_path(self, event_queue, tmpdirs):
         """Test adding a single watch path."""
-        manager = Manager()
-        queue = manager.Queue()
-
-        with tempfile.TemporaryDirectory() as tmpdir:
-            monitor = FSMonitor(event_queue=queue)
-            monitor.add_watch_path(tmpdir, "token1")
+        tmpdir = tmpdirs[0]
+        monitor = FSMonitor(event_queue=event_queue)
+        monitor.add_watch_path(tmpdir, "token1")
 
-            # Path should be added
-            assert tmpdir in monitor.watch_paths or len(monitor.watch_paths) > 0
+        # Path should be added
+        assert tmpdir in monitor.watch_paths or len(monitor.watch_paths) > 0
 
-    def test_add_multiple_watch_paths_sequentially(self):
+    def test_add_multiple_watch_paths_sequentially(self, event_queue, tmpdirs):
         """Test adding multiple paths one by one."""
-        manager = Manager()
-        queue = manager.Queue()
+        tmpdir1, tmpdir2 = tmpdirs[:2]
+        monitor = FSMonitor(event_queue=event_queue)
+        monitor.add_watch_path(tmpdir1, "token1")
+        monitor.add_watch_path(tmpdir2, "token2")
 
-        with tempfile.TemporaryDirectory() as tmpdir1:
-            with tempfile.TemporaryDirectory() as tmpdir2:
-                monitor = FSMonitor(event_queue=queue)
-                monitor.add_watch_path(tmpdir1, "token1")
-                monitor.add_watch_path(tmpdir2, "token2")
+        # Both should be added
+        assert len(monitor.watch_paths) >= 1
 
-                # Both should be added
-                assert len(monitor.watch_paths) >= 1
-
-    def test_remove_existing_path(self):
+    def test_remove_existing_path(self, event_queue):
         """Test removing an existing watch path."""
-        manager = Manager()
-        queue = manager.Queue()
-
-        with tempfile.TemporaryDirectory() as tmpdir1:
-            with tempfile.TemporaryDirectory() as tmpdir2:
-                monitor = FSMonitor(event_queue=queue, watch_paths=[tmpdir1, tmpdir2])
+        tmpdir1, tmpdir2 = _fake_dirs(2)
+        monitor = FSMonitor(event_queue=event_queue, watch_paths=[tmpdir1, tmpdir2])
 
-                initial_count = len(monitor.watch_paths)
-                monitor.remove_watch_path(tmpdir1)
+        initial_count = len(monitor.watch_paths)
+        monitor.remove_watch_path(tmpdir1)
 
-                # Should have one less
-                assert len(monitor.watch_paths) <= initial_count
+        # Should have one less
+        assert len(monitor.watch_paths) <= initial_count
 
 
 if __name__ == "__main__":
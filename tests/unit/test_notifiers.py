@@ -7,7 +7,7 @@ Tests EmailNotifier, DiscordNotifier, and Severity levels.
 import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
@@ -19,6 +19,14 @@ from server.notifiers import (
 )
 
 
+DEFAULT_EMAIL_KWARGS = dict(
+    smtp_host="smtp.example.com",
+    smtp_port=587,
+    from_address="from@example.com",
+    to_addresses=("to@example.com",),
+)
+
+
 class TestSeverity:
     """Test Severity enum."""
 
@@ -63,6 +71,20 @@ class TestNotificationConfig:
         assert config.min_severity == Severity.HIGH
 
 
+@pytest.fixture(scope="class")
+def email_notifier():
+    """Shared EmailNotifier for tests that only call pure formatting methods."""
+    return EmailNotifier(config=NotificationConfig(), **DEFAULT_EMAIL_KWARGS)
+
+
+@pytest.fixture(scope="class")
+def strict_email_notifier():
+    """Shared EmailNotifier that only passes HIGH severity and above."""
+    return EmailNotifier(
+        config=NotificationConfig(min_severity=Severity.HIGH), **DEFAULT_EMAIL_KWARGS
+    )
+
+
 class TestEmailNotifier:
     """Test EmailNotifier."""
 
@@ -84,16 +106,9 @@ class TestEmailNotifier:
         assert notifier.from_address == "honeygrid@example.com"
         assert len(notifier.to_addresses) == 1
 
-    def test_should_notify_severity_filter(self):
+    def test_should_notify_severity_filter(self, strict_email_notifier):
         """Test that notifications are filtered by severity."""
-        config = NotificationConfig(min_severity=Severity.HIGH)
-        notifier = EmailNotifier(
-            config=config,
-            smtp_host="smtp.example.com",
-            smtp_port=587,
-            from_address="from@example.com",
-            to_addresses=["to@example.com"],
-        )
+        notifier = strict_email_notifier
 
         # Should not notify for LOW severity
         event = {"severity": Severity.LOW}
@@ -107,16 +122,9 @@ class TestEmailNotifier:
         event = {"severity": Severity.CRITICAL}
         assert notifier._should_notify(event)
 
-    def test_format_subject(self):
+    def test_format_subject(self, email_notifier):
         """Test email subject formatting."""
-        config = NotificationConfig()
-        notifier = EmailNotifier(
-            config=config,
-            smtp_host="smtp.example.com",
-            smtp_port=587,
-            from_address="from@example.com",
-            to_addresses=["to@example.com"],
-        )
+        notifier = email_notifier
 
         event = {
             "agent_id": "agent-001",
@@ -129,16 +137,9 @@ class TestEmailNotifier:
         assert "agent-001" in subject
         assert "token-123" in subject or "opened" in subject
 
-    def test_format_body(self):
+    def test_format_body(self, email_notifier):
         """Test email body formatting."""
-        config = NotificationConfig()
-        notifier = EmailNotifier(
-            config=config,
-            smtp_host="smtp.example.com",
-            smtp_port=587,
-            from_address="from@example.com",
-            to_addresses=["to@example.com"],
-        )
+        notifier = email_notifier
 
         event = {
             "agent_id": "agent-001",
@@ -171,19 +172,29 @@ class TestDiscordNotifier:
         assert notifier.webhook_url == "https://discord.com/api/webhooks/123/abc"
         assert notifier.username == "HoneyGrid Bot"
 
-    def test_get_embed_color(self):
+    @pytest.mark.parametrize(
+        "severity,color",
+        [
+            (Severity.INFO, 0x3498DB),  # Blue
+            (Severity.LOW, 0x2ECC71),  # Green
+            (Severity.MEDIUM, 0xF39C12),  # Orange
+            (Severity.HIGH, 0xE67E22),  # Dark orange
+            (Severity.CRITICAL, 0xE74C3C),  # Red
+        ],
+    )
+    def test_get_embed_color(self, severity, color):
         """Test Discord embed color selection based on severity."""
         config = NotificationConfig()
         notifier = DiscordNotifier(
             config=config, webhook_url="https://discord.com/api/webhooks/123/abc"
         )
 
-        # Test different severity levels
-        assert notifier._get_embed_color(Severity.INFO) == 0x3498DB  # Blue
-        assert notifier._get_embed_color(Severity.LOW) == 0x2ECC71  # Green
-        assert notifier._get_embed_color(Severity.MEDIUM) == 0xF39C12  # Orange
-        assert notifier._get_embed_color(Severity.HIGH) == 0xE67E22  # Dark orange
-        assert notifier._get_embed_color(Severity.CRITICAL) == 0xE74C3C  # Red
+        assert notifier._get_embed_color(severity) == color
+
+    def test_severity_colors_cover_all_levels(self):
+        """Test that the color table is a dict keyed by every severity."""
+        assert isinstance(DiscordNotifier._SEVERITY_COLORS, dict)
+        assert set(DiscordNotifier._SEVERITY_COLORS) == set(Severity)
 
     def test_format_embed(self):
         """Test Discord embed formatting."""
@@ -209,15 +220,13 @@ class TestDiscordNotifier:
         assert "fields" in embed
 
         # Check that key info is in fields (field names have emoji prefixes)
-        fields = {f["name"]: f["value"] for f in embed["fields"]}
-        # Fields have emoji prefixes like "🧭 Agent", "🔖 Token", etc.
-        field_names = set(fields.keys())
-        assert any("Agent" in name for name in field_names), f"Agent field not found in {field_names}"
-        assert any("Token" in name for name in field_names), f"Token field not found in {field_names}"
-        assert any("Event" in name for name in field_names), f"Event field not found in {field_names}"
-
-    @pytest.mark.asyncio
-    async def test_notify_disabled(self):
+        present = {
+            tag: any(tag in f["name"] for f in embed["fields"])
+            for tag in ("Agent", "Token", "Event")
+        }
+        assert all(present.values()), present
+
+    def test_notify_disabled(self):
         """Test that notification is skipped when disabled."""
         config = NotificationConfig(enabled=False)
         notifier = DiscordNotifier(
@@ -226,24 +235,17 @@ class TestDiscordNotifier:
 
         event = {"agent_id": "test", "severity": Severity.HIGH}
 
-        # Should not raise error and should skip
-        await notifier.notify(event)
+        # notify() returns before awaiting anything when this guard fails
+        assert notifier._should_notify(event) is False
 
 
 class TestRateLimiting:
     """Test rate limiting functionality."""
 
-    @pytest.mark.asyncio
-    async def test_rate_limit_blocks_duplicate(self):
+    def test_rate_limit_blocks_duplicate(self):
         """Test that rate limiting prevents duplicate notifications."""
         config = NotificationConfig(rate_limit_seconds=60)
-        notifier = EmailNotifier(
-            config=config,
-            smtp_host="smtp.example.com",
-            smtp_port=587,
-            from_address="from@example.com",
-            to_addresses=["to@example.com"],
-        )
+        notifier = EmailNotifier(config=config, **DEFAULT_EMAIL_KWARGS)
 
         event = {
             "agent_id": "agent-001",
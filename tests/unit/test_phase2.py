@@ -4,8 +4,8 @@ Unit tests for enhanced monitoring: File Hash Tracker and Process Capture
 """
 
 import pytest
+import itertools
 import os
-import tempfile
 import hashlib
 import time
 from pathlib import Path
@@ -17,6 +17,32 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from agent.monitor import FileHashTracker, MonitorEvent
 from agent.process_info import ProcessCapture
 
+_file_ids = itertools.count()
+
+
+def _write_file(root, data):
+    """Write data to a new uniquely named file under root and return its path."""
+    path = root / f"token-{next(_file_ids)}.txt"
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.fixture
+def temp_file(fast_tmp):
+    """Create a temporary file for testing (removed with fast_tmp at session end)."""
+    return _write_file(fast_tmp, b"Test content for hashing")
+
+
+@pytest.fixture(scope="module", params=[64, 1024, 10 * 1024 * 1024], ids=["64B", "1KB", "10MB"])
+def sized_file(request, fast_tmp):
+    """Files of several sizes, shared by tests that only read them."""
+    return _write_file(fast_tmp, b"x" * request.param)
+
+
+# Sentinel for test_content_change: delete the file instead of rewriting it
+_DELETE = object()
+
+
 
 class TestFileHashTracker:
     """Tests for FileHashTracker class."""
@@ -26,37 +52,39 @@ class TestFileHashTracker:
         """Create a FileHashTracker instance."""
         return FileHashTracker()
 
-    @pytest.fixture
-    def temp_file(self):
-        """Create a temporary file for testing."""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-            f.write("Test content for hashing")
-            temp_path = f.name
-        yield temp_path
-        # Cleanup
-        try:
-            os.unlink(temp_path)
-        except:
-            pass
 
-    def test_calculate_hash(self, tracker, temp_file):
-        """Test hash calculation."""
-        hash1 = tracker.calculate_hash(temp_file)
+    def test_calculate_hash(self, tracker, sized_file):
+        """Test hash calculation is correct and consistent across file sizes."""
+        hash1 = tracker.calculate_hash(sized_file)
         assert hash1 is not None
         assert len(hash1) == 64  # SHA256 hex is 64 chars
         assert hash1.isalnum()
+        assert tracker.calculate_hash(sized_file) == hash1
 
-    def test_calculate_hash_consistency(self, tracker, temp_file):
-        """Test that hash calculation is consistent."""
-        hash1 = tracker.calculate_hash(temp_file)
-        hash2 = tracker.calculate_hash(temp_file)
-        assert hash1 == hash2
+        with open(sized_file, 'rb') as f:
+            assert hash1 == hashlib.sha256(f.read()).hexdigest()
 
     def test_calculate_hash_file_not_found(self, tracker):
         """Test hash calculation with non-existent file."""
         hash_result = tracker.calculate_hash("/nonexistent/file.txt")
         assert hash_result is None
 
+    def test_default_backend(self, tracker):
+        """Test the tracker picks file_digest whenever hashlib provides it."""
+        expected = "file_digest" if hasattr(hashlib, "file_digest") else "portable"
+        assert tracker.backend == expected
+
+    @pytest.mark.parametrize("backend", ["file_digest", "portable"])
+    def test_calculate_hash_backends(self, tracker, temp_file, backend):
+        """Test every hashing backend produces the reference SHA256."""
+        if backend == "file_digest" and not hasattr(hashlib, "file_digest"):
+            pytest.skip("hashlib.file_digest requires Python 3.11+")
+        tracker.backend = backend
+
+        with open(temp_file, 'rb') as f:
+            expected = hashlib.sha256(f.read()).hexdigest()
+        assert tracker.calculate_hash(temp_file) == expected
+
     def test_store_hash(self, tracker, temp_file):
         """Test storing a hash."""
         hash_value = "abc123def456"
@@ -76,20 +104,53 @@ class TestFileHashTracker:
         hash_result = tracker.get_original_hash("/unknown/path.txt")
         assert hash_result is None
 
-    def test_content_change_detection(self, tracker, temp_file):
-        """Test detection of file content changes."""
-        # Store original hash
-        original_hash = tracker.calculate_hash(temp_file)
-        tracker.store_hash(temp_file, original_hash)
+    @pytest.mark.parametrize(
+        "write_after,expect_change",
+        [(None, False), (b"Modified content!", True), (_DELETE, True)],
+        ids=["unchanged", "modified", "deleted"],
+    )
+    def test_content_change(self, tracker, temp_file, write_after, expect_change):
+        """Test detection of unchanged, modified and deleted files."""
+        tracker.store_hash(temp_file)
+
+        if write_after is _DELETE:
+            os.unlink(temp_file)
+        elif write_after is not None:
+            with open(temp_file, 'wb') as f:
+                f.write(write_after)
+
+        assert tracker.has_content_changed(temp_file) == expect_change
+
+    def test_content_change_uses_supplied_hash(self, tracker, temp_file, monkeypatch):
+        """Test that a caller-supplied current hash is not recomputed."""
+        tracker.store_hash(temp_file, "abc123")
+        monkeypatch.setattr(tracker, "calculate_hash", lambda path: pytest.fail("rehashed"))
 
-        # File hasn't changed yet
-        assert not tracker.has_content_changed(temp_file)
+        assert not tracker.has_content_changed(temp_file, "abc123")
+        assert tracker.has_content_changed(temp_file, "def456")
 
-        # Modify file
-        with open(temp_file, 'w') as f:
-            f.write("Modified content!")
+    def test_hash_cache_survives_pure_read(self, tracker, temp_file, monkeypatch):
+        """Test that reading an unchanged file is served from the stat cache."""
+        old_ns = time.time_ns() - 10 * 1_000_000_000
+        os.utime(temp_file, ns=(old_ns, old_ns))
+        expected = tracker.calculate_hash(temp_file)
+
+        with open(temp_file, 'rb') as f:
+            f.read()
+        monkeypatch.setattr(tracker, "_hash_file", lambda path: pytest.fail("rehashed"))
+
+        assert tracker.calculate_hash(temp_file) == expected
+
+    def test_hash_cache_detects_rewrite_with_restored_mtime(self, tracker, temp_file):
+        """Test that a same-size rewrite is caught even if mtime is put back."""
+        old_ns = time.time_ns() - 10 * 1_000_000_000
+        os.utime(temp_file, ns=(old_ns, old_ns))
+        tracker.store_hash(temp_file)
+
+        with open(temp_file, 'wb') as f:
+            f.write(b"Test content for HASHING")
+        os.utime(temp_file, ns=(old_ns, old_ns))
 
-        # Now it should detect the change
         assert tracker.has_content_changed(temp_file)
 
     def test_content_change_with_no_original(self, tracker, temp_file):
@@ -97,12 +158,6 @@ class TestFileHashTracker:
         # No original hash stored, so no change detected
         assert not tracker.has_content_changed(temp_file)
 
-    def test_content_change_deleted_file(self, tracker, temp_file):
-        """Test detection when file is deleted."""
-        tracker.store_hash(temp_file, "abc123")
-        os.unlink(temp_file)
-        assert tracker.has_content_changed(temp_file)
-
     def test_get_hash_pair(self, tracker, temp_file):
         """Test getting hash pair (original and current)."""
         original_hash = tracker.calculate_hash(temp_file)
@@ -112,43 +167,54 @@ class TestFileHashTracker:
         assert original == original_hash
         assert current == original_hash
 
-    def test_multiple_files(self, tracker):
+    def test_multiple_files(self, tracker, fast_tmp):
         """Test tracking multiple files."""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f1:
-            f1.write("File 1")
-            file1 = f1.name
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f2:
-            f2.write("File 2")
-            file2 = f2.name
-
-        try:
-            hash1 = tracker.calculate_hash(file1)
-            hash2 = tracker.calculate_hash(file2)
-
-            tracker.store_hash(file1, hash1)
-            tracker.store_hash(file2, hash2)
-
-            assert hash1 != hash2
-            assert tracker.get_original_hash(file1) == hash1
-            assert tracker.get_original_hash(file2) == hash2
-        finally:
-            os.unlink(file1)
-            os.unlink(file2)
-
-    def test_large_file_hash(self, tracker):
-        """Test hashing a larger file."""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-            # Write 10MB of data
-            for i in range(10000):
-                f.write("x" * 1024)
-            temp_path = f.name
-
-        try:
-            hash_result = tracker.calculate_hash(temp_path)
-            assert hash_result is not None
-            assert len(hash_result) == 64
-        finally:
-            os.unlink(temp_path)
+        file1 = _write_file(fast_tmp, b"File 1")
+        file2 = _write_file(fast_tmp, b"File 2")
+
+        hashes = tracker.calculate_hashes([file1, file2])
+        hash1, hash2 = hashes[file1], hashes[file2]
+
+        tracker.store_hash(file1, hash1)
+        tracker.store_hash(file2, hash2)
+
+        assert hash1 != hash2
+        assert tracker.get_original_hash(file1) == hash1
+        assert tracker.get_original_hash(file2) == hash2
+
+    def test_calculate_hashes_matches_single(self, tracker, temp_file):
+        """Test bulk hashing agrees with calculate_hash and reports unreadable files."""
+        missing = "/nonexistent/file.txt"
+        hashes = tracker.calculate_hashes([temp_file, missing])
+
+        assert hashes == {temp_file: tracker.calculate_hash(temp_file), missing: None}
+        assert tracker.calculate_hashes([]) == {}
+
+    def test_unknown_algorithm_rejected(self):
+        """Test that an unsupported hash algorithm is refused."""
+        with pytest.raises(ValueError):
+            FileHashTracker(algorithm="md5")
+
+    def test_blake3_requires_package(self, monkeypatch):
+        """Test that blake3 mode fails clearly when the package is missing."""
+        monkeypatch.setattr("agent.monitor._blake3", None)
+        with pytest.raises(ValueError, match="blake3"):
+            FileHashTracker(algorithm="blake3")
+
+    @pytest.mark.parametrize("backend", ["file_digest", "portable"])
+    def test_blake3_hash(self, temp_file, backend):
+        """Test blake3 mode produces the reference BLAKE3-256 on every backend."""
+        blake3 = pytest.importorskip("blake3")
+        if backend == "file_digest" and not hasattr(hashlib, "file_digest"):
+            pytest.skip("hashlib.file_digest requires Python 3.11+")
+        tracker = FileHashTracker(algorithm="blake3")
+        tracker.backend = backend
+
+        with open(temp_file, 'rb') as f:
+            expected = blake3.blake3(f.read()).hexdigest()
+        hash_result = tracker.calculate_hash(temp_file)
+        assert hash_result == expected
+        assert len(hash_result) == 64
 
 
 class TestProcessCapture:
@@ -196,25 +262,79 @@ class TestProcessCapture:
         except ImportError:
             pytest.skip("psutil not available")
 
-    def test_get_system_processes_accessing_path(self):
+    @pytest.mark.slow
+    def test_get_system_processes_accessing_path(self, tmp_path):
         """Test getting processes accessing a specific path."""
-        with tempfile.NamedTemporaryFile(delete=False) as f:
-            temp_path = f.name
-            f.write(b"test data")
+        temp_path = tmp_path / "f.txt"
+        temp_path.write_bytes(b"test data")
+
+        processes = ProcessCapture.get_system_processes_accessing_path(str(temp_path))
+        # Result may be empty on restricted systems, but should be a list
+        assert isinstance(processes, list)
+        for proc in processes:
+            assert isinstance(proc, dict)
+            assert "process_name" in proc
+            assert "process_id" in proc
+
+    def test_process_scan_is_cached(self, monkeypatch):
+        """Test repeated scans of one path within the cache window reuse results."""
+        import agent.process_info as process_info
+
+        calls = []
+        monkeypatch.setattr(ProcessCapture, "_scan_cache", {})
+        monkeypatch.setattr(
+            process_info.psutil, "process_iter", lambda attrs: calls.append(attrs) or []
+        )
 
-        try:
-            processes = ProcessCapture.get_system_processes_accessing_path(temp_path)
-            # Result may be empty on restricted systems, but should be a list
-            assert isinstance(processes, list)
-            for proc in processes:
-                assert isinstance(proc, dict)
-                assert "process_name" in proc
-                assert "process_id" in proc
-        finally:
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
+        first = ProcessCapture.get_system_processes_accessing_path("/tmp/honey.txt")
+        first.append({"process_name": "caller mutation"})
+        second = ProcessCapture.get_system_processes_accessing_path("/tmp/honey.txt")
+
+        assert len(calls) == 1
+        assert second == []
+
+        monkeypatch.setattr(process_info, "PROCESS_SCAN_CACHE_SECONDS", 0)
+        ProcessCapture.get_system_processes_accessing_path("/tmp/honey.txt")
+        assert len(calls) == 2
+
+    def test_process_scan_cache_returns_copies(self, monkeypatch):
+        """Test editing a returned process dict does not change the cached scan."""
+        import types
+        import agent.process_info as process_info
+
+        proc = types.SimpleNamespace(
+            open_files=lambda: [types.SimpleNamespace(path="/tmp/honey.txt")]
+        )
+        monkeypatch.setattr(ProcessCapture, "_scan_cache", {})
+        monkeypatch.setattr(process_info.psutil, "process_iter", lambda attrs: [proc])
+        monkeypatch.setattr(
+            ProcessCapture,
+            "_format_process_info",
+            staticmethod(lambda p: {"process_name": "cat", "process_id": 42}),
+        )
+
+        first = ProcessCapture.get_system_processes_accessing_path("/tmp/honey.txt")
+        first[0]["process_name"] = "caller mutation"
+        second = ProcessCapture.get_system_processes_accessing_path("/tmp/honey.txt")
+
+        assert second == [{"process_name": "cat", "process_id": 42}]
+
+    def test_failed_process_scan_is_not_cached(self, monkeypatch):
+        """Test a scan that raised is retried on the next query."""
+        import agent.process_info as process_info
+
+        calls = []
+
+        def failing_iter(attrs):
+            calls.append(attrs)
+            raise RuntimeError("scan failed")
+
+        monkeypatch.setattr(ProcessCapture, "_scan_cache", {})
+        monkeypatch.setattr(process_info.psutil, "process_iter", failing_iter)
+
+        assert ProcessCapture.get_system_processes_accessing_path("/tmp/honey.txt") == []
+        assert ProcessCapture.get_system_processes_accessing_path("/tmp/honey.txt") == []
+        assert len(calls) == 2
 
     def test_process_capture_error_handling(self):
         """Test that process capture handles errors gracefully."""
@@ -224,20 +344,16 @@ class TestProcessCapture:
         assert info is None or isinstance(info, dict)
 
     @pytest.mark.skipif(True, reason="Requires admin privileges on Windows")
-    def test_get_process_by_file_access(self):
+    def test_get_process_by_file_access(self, tmp_path):
         """Test identifying process by file access."""
         # This test requires admin privileges and specific OS support
-        with tempfile.NamedTemporaryFile(delete=False) as f:
-            temp_path = f.name
-            f.write(b"test")
+        temp_path = tmp_path / "f.txt"
+        temp_path.write_bytes(b"test")
 
-        try:
-            # Try to get the process
-            info = ProcessCapture.get_process_by_file_access(temp_path)
-            # May be None if we can't determine it, but shouldn't crash
-            assert info is None or isinstance(info, dict)
-        finally:
-            os.unlink(temp_path)
+        # Try to get the process
+        info = ProcessCapture.get_process_by_file_access(str(temp_path))
+        # May be None if we can't determine it, but shouldn't crash
+        assert info is None or isinstance(info, dict)
 
 
 class TestMonitorEventEnhanced:
@@ -312,6 +428,23 @@ class TestMonitorEventEnhanced:
         assert event_dict["file_hash_original"] == "hash1"
         assert event_dict["content_modified"] is True
 
+    def test_monitor_event_is_slotted(self):
+        """Test that events carry no instance dict and survive queue pickling."""
+        import pickle
+
+        event = MonitorEvent(
+            token_id="token-001",
+            path="/path/to/file.txt",
+            event_type="opened",
+            timestamp=1234567890,
+            is_directory=False,
+            metadata={"extra": "data"},
+            process_id=42,
+        )
+
+        assert not hasattr(event, "__dict__")
+        assert pickle.loads(pickle.dumps(event)) == event
+
     def test_monitor_event_optional_fields(self):
         """Test that enhanced monitoring fields are optional."""
         event = MonitorEvent(
@@ -336,58 +469,52 @@ class TestMonitorEventEnhanced:
 class TestEnhancedMonitoringIntegration:
     """Integration tests for enhanced monitoring features."""
 
-    def test_file_operations_with_hash_tracking(self):
+    def test_file_operations_with_hash_tracking(self, fast_tmp):
         """Test file operations with hash tracking."""
         tracker = FileHashTracker()
 
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-            f.write("Initial content")
-            temp_path = f.name
+        temp_path = _write_file(fast_tmp, b"Initial content")
 
-        try:
-            # Create event with initial hash
-            initial_hash = tracker.calculate_hash(temp_path)
-            tracker.store_hash(temp_path, initial_hash)
-
-            event1 = MonitorEvent(
-                token_id="token-001",
-                path=temp_path,
-                event_type="created",
-                timestamp=time.time(),
-                is_directory=False,
-                metadata={},
-                file_hash_original=initial_hash,
-                file_hash_current=initial_hash,
-                content_modified=False,
-            )
-
-            assert not event1.content_modified
-
-            # Modify file
-            with open(temp_path, 'w') as f:
-                f.write("Modified content")
-
-            # Create event with modified hash
-            modified_hash = tracker.calculate_hash(temp_path)
-            content_changed = tracker.has_content_changed(temp_path)
-
-            event2 = MonitorEvent(
-                token_id="token-001",
-                path=temp_path,
-                event_type="modified",
-                timestamp=time.time(),
-                is_directory=False,
-                metadata={},
-                file_hash_original=initial_hash,
-                file_hash_current=modified_hash,
-                content_modified=content_changed,
-            )
-
-            assert event2.content_modified
-            assert event1.file_hash_original != event2.file_hash_current
-
-        finally:
-            os.unlink(temp_path)
+        # Create event with initial hash
+        initial_hash = tracker.calculate_hash(temp_path)
+        tracker.store_hash(temp_path, initial_hash)
+
+        event1 = MonitorEvent(
+            token_id="token-001",
+            path=temp_path,
+            event_type="created",
+            timestamp=time.time(),
+            is_directory=False,
+            metadata={},
+            file_hash_original=initial_hash,
+            file_hash_current=initial_hash,
+            content_modified=False,
+        )
+
+        assert not event1.content_modified
+
+        # Modify file
+        with open(temp_path, 'wb') as f:
+            f.write(b"Modified content")
+
+        # Create event with modified hash
+        modified_hash = tracker.calculate_hash(temp_path)
+        content_changed = tracker.has_content_changed(temp_path, modified_hash)
+
+        event2 = MonitorEvent(
+            token_id="token-001",
+            path=temp_path,
+            event_type="modified",
+            timestamp=time.time(),
+            is_directory=False,
+            metadata={},
+            file_hash_original=initial_hash,
+            file_hash_current=modified_hash,
+            content_modified=content_changed,
+        )
+
+        assert event2.content_modified
+        assert event1.file_hash_original != event2.file_hash_current
 
     def test_event_serialization_with_enhanced_data(self):
         """Test that events with enhanced monitoring data can be serialized."""
@@ -409,12 +536,8 @@ class TestEnhancedMonitoringIntegration:
             content_modified=True,
         )
 
-        # Convert to dict and serialize to JSON
-        event_dict = event.to_dict()
-        json_str = json.dumps(event_dict)
-
-        # Deserialize back
-        deserialized = json.loads(json_str)
+        # Serialize to JSON bytes (orjson when installed) and back
+        deserialized = json.loads(event.to_json())
 
         assert deserialized["token_id"] == "token-001"
         assert deserialized["process_name"] == "app.exe"
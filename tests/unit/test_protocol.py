@@ -5,9 +5,9 @@ Tests message creation, framing, parsing, and validation.
 """
 
 import pytest
+import os
 import time
 import json
-import struct
 import base64
 import secrets
 from pathlib import Path
@@ -29,6 +29,7 @@ from server.protocol import (
     FramingError,
     MessageTooLargeError,
     NONCE_SIZE,
+    LENGTH_PREFIX,
 )
 
 
@@ -38,7 +39,7 @@ class TestNonceGeneration:
     def test_nonce_length(self):
         """Test that nonce is correct length."""
         nonce = generate_nonce()
-        decoded = base64.b64decode(nonce)
+        decoded = base64.urlsafe_b64decode(nonce + "==")
         assert len(decoded) == NONCE_SIZE
 
     def test_nonce_uniqueness(self):
@@ -50,29 +51,45 @@ class TestNonceGeneration:
         """Test that nonce is valid base64."""
         nonce = generate_nonce()
         # Should not raise exception
-        decoded = base64.b64decode(nonce)
+        decoded = base64.urlsafe_b64decode(nonce + "==")
         assert decoded is not None
 
 
+@pytest.fixture(scope="class")
+def nonce_pool():
+    """32 valid nonces sliced from a single os.urandom call; tests pop() one."""
+    raw = os.urandom(32 * NONCE_SIZE)
+    return [
+        base64.urlsafe_b64encode(raw[i * NONCE_SIZE : (i + 1) * NONCE_SIZE]).decode()
+        for i in range(32)
+    ]
+
+
+@pytest.fixture(scope="class")
+def now():
+    """Current Unix time, read once per class; well inside the 60s tolerance."""
+    return int(time.time())
+
+
 class TestMessageHeader:
     """Test MessageHeader class."""
 
-    def test_create_header(self):
+    def test_create_header(self, nonce_pool, now):
         """Test creating a message header."""
         header = MessageHeader(
-            nonce=generate_nonce(),
-            timestamp=int(time.time()),
+            nonce=nonce_pool.pop(),
+            timestamp=now,
             agent_id="agent-001",
             msg_type="event",
         )
         assert header.agent_id == "agent-001"
         assert header.msg_type == "event"
 
-    def test_header_to_dict(self):
+    def test_header_to_dict(self, nonce_pool, now):
         """Test converting header to dict."""
         header = MessageHeader(
-            nonce=generate_nonce(),
-            timestamp=int(time.time()),
+            nonce=nonce_pool.pop(),
+            timestamp=now,
             agent_id="agent-001",
             msg_type="event",
         )
@@ -82,11 +99,11 @@ class TestMessageHeader:
         assert "agent_id" in d
         assert "msg_type" in d
 
-    def test_header_from_dict(self):
+    def test_header_from_dict(self, nonce_pool, now):
         """Test creating header from dict."""
         data = {
-            "nonce": generate_nonce(),
-            "timestamp": int(time.time()),
+            "nonce": nonce_pool.pop(),
+            "timestamp": now,
             "agent_id": "agent-001",
             "msg_type": "event",
         }
@@ -94,44 +111,55 @@ class TestMessageHeader:
         assert header.agent_id == "agent-001"
         assert header.msg_type == "event"
 
-    def test_header_validation_valid(self):
+    def test_header_validation_valid(self, nonce_pool, now):
         """Test validating a valid header."""
         header = MessageHeader(
-            nonce=generate_nonce(),
-            timestamp=int(time.time()),
+            nonce=nonce_pool.pop(),
+            timestamp=now,
             agent_id="agent-001",
             msg_type="event",
         )
         # Should not raise exception
         header.validate()
 
-    def test_header_validation_invalid_nonce(self):
+    def test_header_validation_accepts_standard_base64_nonce(self, now):
+        """Test validation still accepts standard base64 nonces from older agents."""
+        header = MessageHeader(
+            nonce=base64.b64encode(b"\xfb\xff" * (NONCE_SIZE // 2)).decode("ascii"),
+            timestamp=now,
+            agent_id="agent-001",
+            msg_type="event",
+        )
+        assert "+" in header.nonce or "/" in header.nonce
+        header.validate()  # Should not raise
+
+    def test_header_validation_invalid_nonce(self, now):
         """Test validation fails with invalid nonce."""
         header = MessageHeader(
             nonce="invalid_nonce",
-            timestamp=int(time.time()),
+            timestamp=now,
             agent_id="agent-001",
             msg_type="event",
         )
         with pytest.raises(ValidationError):
             header.validate()
 
-    def test_header_validation_invalid_timestamp(self):
+    def test_header_validation_invalid_timestamp(self, nonce_pool, now):
         """Test validation fails with old timestamp."""
         header = MessageHeader(
-            nonce=generate_nonce(),
-            timestamp=int(time.time()) - 120,  # 2 minutes ago
+            nonce=nonce_pool.pop(),
+            timestamp=now - 120,  # 2 minutes ago
             agent_id="agent-001",
             msg_type="event",
         )
         with pytest.raises(ValidationError):
             header.validate()
 
-    def test_header_validation_invalid_msg_type(self):
+    def test_header_validation_invalid_msg_type(self, nonce_pool, now):
         """Test validation fails with invalid message type."""
         header = MessageHeader(
-            nonce=generate_nonce(),
-            timestamp=int(time.time()),
+            nonce=nonce_pool.pop(),
+            timestamp=now,
             agent_id="agent-001",
             msg_type="invalid_type",
         )
@@ -201,7 +229,7 @@ class TestFraming:
         framed = frame_message(msg)
 
         # Check length prefix
-        length = struct.unpack("!I", framed[:4])[0]
+        length = LENGTH_PREFIX.unpack_from(framed)[0]
         assert length == len(framed) - 4
 
     def test_frame_parse_roundtrip(self):
@@ -226,12 +254,31 @@ class TestFraming:
         assert parsed.header.agent_id == original.header.agent_id
         assert parsed.data["token_id"] == original.data["token_id"]
 
+    def test_frame_parse_roundtrip_stdlib_json(self, monkeypatch):
+        """Test framing still round-trips when orjson is not installed."""
+        monkeypatch.setattr("server.protocol.orjson", None)
+        original = create_event_message(
+            agent_id="agent-001", token_id="token-001", path="/x", event_type="opened"
+        )
+
+        parsed = parse_message(frame_message(original)[4:])
+
+        assert parsed.data == original.data
+
     def test_parse_invalid_json(self):
         """Test parsing invalid JSON fails."""
         invalid_json = b"not valid json"
         with pytest.raises(ValidationError):
             parse_message(invalid_json)
 
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_parse_invalid_utf8(self, monkeypatch, use_orjson):
+        """Test parsing non-UTF-8 bytes fails with either JSON backend."""
+        if not use_orjson:
+            monkeypatch.setattr("server.protocol.orjson", None)
+        with pytest.raises(ValidationError):
+            parse_message(b'{"header": "\xff\xfe"}')
+
     def test_parse_missing_header(self):
         """Test parsing message without header fails."""
         invalid_msg = json.dumps({"data": {}}).encode("utf-8")
@@ -270,6 +317,27 @@ class TestValidation:
         with pytest.raises(ValidationError):
             msg.validate()
 
+    @pytest.mark.parametrize(
+        "field,value",
+        [
+            ("nonce", base64.b64encode(b"\x00" * 10).decode()),  # 16 chars, 10 bytes
+            ("nonce", 12345),
+            ("msg_type", ["event"]),
+        ],
+    )
+    def test_malformed_header_fields(self, field, value):
+        """Test malformed nonce and msg_type values raise ValidationError."""
+        fields = {
+            "nonce": generate_nonce(),
+            "timestamp": int(time.time()),
+            "agent_id": "agent-001",
+            "msg_type": "event",
+        }
+        fields[field] = value
+
+        with pytest.raises(ValidationError):
+            MessageHeader(**fields).validate()
+
     def test_timestamp_tolerance(self):
         """Test timestamp validation tolerance."""
         # 50 seconds ago (within tolerance)
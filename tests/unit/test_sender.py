@@ -15,33 +15,70 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from agent.sender import RateLimiter
 
 
+class MockClock:
+    """Manually advanced clock for RateLimiter's time_fn/sleep_fn hooks."""
+
+    def __init__(self):
+        self.now_ns = 1_000_000_000
+        self.sleeps = []
+
+    def now(self) -> int:
+        """Current time in nanoseconds."""
+        return self.now_ns
+
+    def advance(self, seconds: float):
+        """Move the clock forward."""
+        self.now_ns += int(seconds * 1_000_000_000)
+
+    def sleep(self, seconds: float):
+        """Record the sleep and advance the clock instead of blocking."""
+        self.sleeps.append(seconds)
+        self.advance(seconds)
+
+
+@pytest.fixture
+def clock():
+    """Fresh mock clock."""
+    return MockClock()
+
+
+@pytest.fixture
+def make_limiter(clock):
+    """Build RateLimiters driven by the mock clock."""
+
+    def _make(rate: float, burst: int) -> RateLimiter:
+        return RateLimiter(
+            rate=rate, burst=burst, time_fn=clock.now, sleep_fn=clock.sleep
+        )
+
+    return _make
+
+
 class TestRateLimiter:
     """Test rate limiter (token bucket algorithm)."""
 
-    def test_initial_tokens(self):
+    def test_initial_tokens(self, make_limiter):
         """Test that limiter starts with full bucket."""
-        limiter = RateLimiter(rate=10.0, burst=20)
+        limiter = make_limiter(rate=10.0, burst=20)
         assert limiter.get_tokens() == 20.0
 
-    def test_acquire_single(self):
+    def test_acquire_single(self, make_limiter):
         """Test acquiring a single token."""
-        limiter = RateLimiter(rate=10.0, burst=20)
+        limiter = make_limiter(rate=10.0, burst=20)
         success = limiter.acquire(tokens=1, blocking=False)
         assert success is True
-        # Allow small variance due to time passing
-        assert 18.9 <= limiter.get_tokens() <= 19.1
+        assert limiter.get_tokens() == 19.0
 
-    def test_acquire_multiple(self):
+    def test_acquire_multiple(self, make_limiter):
         """Test acquiring multiple tokens."""
-        limiter = RateLimiter(rate=10.0, burst=20)
+        limiter = make_limiter(rate=10.0, burst=20)
         success = limiter.acquire(tokens=5, blocking=False)
         assert success is True
-        # Allow small variance due to time passing
-        assert 14.9 <= limiter.get_tokens() <= 15.1
+        assert limiter.get_tokens() == 15.0
 
-    def test_acquire_exceeds_available(self):
+    def test_acquire_exceeds_available(self, make_limiter):
         """Test that acquiring more than available fails."""
-        limiter = RateLimiter(rate=10.0, burst=5)
+        limiter = make_limiter(rate=10.0, burst=5)
 
         # Consume all tokens
         limiter.acquire(tokens=5, blocking=False)
@@ -50,54 +87,72 @@ class TestRateLimiter:
         success = limiter.acquire(tokens=1, blocking=False, timeout=0.1)
         assert success is False
 
-    def test_refill_over_time(self):
+    def test_refill_over_time(self, make_limiter, clock):
         """Test that tokens refill over time."""
-        limiter = RateLimiter(rate=10.0, burst=10)  # 10 tokens/sec
+        limiter = make_limiter(rate=10.0, burst=10)  # 10 tokens/sec
 
         # Consume all tokens
         limiter.acquire(tokens=10, blocking=False)
-        # Small amount of time passes, allow minor refill
-        assert limiter.get_tokens() < 0.1
+        assert limiter.get_tokens() == 0.0
 
-        # Wait 1 second
-        time.sleep(1.0)
+        clock.advance(0.5)
+        assert limiter.get_tokens() == pytest.approx(5.0)
 
-        # Should have refilled ~10 tokens
-        tokens = limiter.get_tokens()
-        assert 9.0 <= tokens <= 10.0
+        clock.advance(0.5)
+        assert limiter.get_tokens() == pytest.approx(10.0)
 
-    def test_refill_does_not_exceed_burst(self):
+    def test_refill_does_not_exceed_burst(self, make_limiter, clock):
         """Test that refill doesn't exceed burst capacity."""
-        limiter = RateLimiter(rate=10.0, burst=5)
+        limiter = make_limiter(rate=10.0, burst=5)
 
         # Start with full bucket
         assert limiter.get_tokens() == 5.0
 
-        # Wait 2 seconds (would add 20 tokens at rate)
-        time.sleep(2.0)
+        # 2 seconds would add 20 tokens at rate
+        clock.advance(2.0)
 
         # Should be capped at burst size
-        tokens = limiter.get_tokens()
-        assert tokens <= 5.0
+        assert limiter.get_tokens() == 5.0
 
-    def test_acquire_with_timeout(self):
+    def test_refill_ignores_wall_clock(self, monkeypatch):
+        """Test that a wall-clock jump does not refill the bucket."""
+        limiter = RateLimiter(rate=10.0, burst=10)
+        limiter.acquire(tokens=10, blocking=False)
+
+        real_time = time.time
+        monkeypatch.setattr(time, "time", lambda: real_time() + 3600)
+
+        assert limiter.get_tokens() < 1.0
+
+    def test_acquire_with_timeout(self, make_limiter, clock):
         """Test acquire with blocking and timeout."""
-        limiter = RateLimiter(rate=5.0, burst=1)
+        limiter = make_limiter(rate=5.0, burst=1)
 
         # Consume token
         limiter.acquire(tokens=1, blocking=False)
 
-        # Try to acquire with short timeout (should fail)
-        start = time.time()
+        # Refill takes 0.2s, longer than the timeout
         success = limiter.acquire(tokens=1, blocking=True, timeout=0.1)
-        elapsed = time.time() - start
 
         assert success is False
-        assert elapsed < 0.2  # Should timeout quickly
+        assert clock.sleeps == []  # Fails without sleeping
+
+    def test_blocking_acquire_sleeps_once(self, make_limiter, clock):
+        """Test that a blocking acquire sleeps just long enough, once."""
+        limiter = make_limiter(rate=10.0, burst=1)
+        limiter.acquire(tokens=1, blocking=False)
 
-    def test_concurrent_acquire(self):
+        assert limiter.acquire(tokens=1, blocking=True, timeout=1.0) is True
+        assert clock.sleeps == [pytest.approx(0.1)]
+
+    def test_acquire_more_than_burst(self, make_limiter):
+        """Test that a request larger than the bucket never blocks forever."""
+        limiter = make_limiter(rate=10.0, burst=5)
+        assert limiter.acquire(tokens=6, blocking=True) is False
+
+    def test_concurrent_acquire(self, make_limiter):
         """Test that acquire is thread-safe."""
-        limiter = RateLimiter(rate=100.0, burst=10)
+        limiter = make_limiter(rate=100.0, burst=10)
 
         # Rapid acquire calls
         results = []
@@ -107,68 +162,71 @@ class TestRateLimiter:
 
         # First 5 should succeed (10 tokens available, 2 each)
         assert results == [True, True, True, True, True]
-        # Allow small variance due to time passing and refill
-        assert limiter.get_tokens() < 1.0
+        assert limiter.get_tokens() == 0.0
 
 
 class TestRateLimiterEdgeCases:
     """Test rate limiter edge cases."""
 
-    def test_zero_tokens_request(self):
+    def test_zero_tokens_request(self, make_limiter):
         """Test requesting zero tokens."""
-        limiter = RateLimiter(rate=10.0, burst=10)
+        limiter = make_limiter(rate=10.0, burst=10)
         success = limiter.acquire(tokens=0, blocking=False)
         assert success is True  # Should always succeed
         assert limiter.get_tokens() == 10.0  # No tokens consumed
 
-    def test_fractional_rate(self):
+    def test_zero_tokens_request_skips_lock(self, make_limiter):
+        """Test that a zero-token request does not wait on the lock."""
+        limiter = make_limiter(rate=10.0, burst=10)
+        with limiter.lock:
+            assert limiter.acquire(tokens=0, blocking=False) is True
+
+    def test_fractional_rate(self, make_limiter, clock):
         """Test fractional rate (less than 1 token/sec)."""
-        limiter = RateLimiter(rate=0.5, burst=2)
+        limiter = make_limiter(rate=0.5, burst=2)
 
         # Consume all tokens
         limiter.acquire(tokens=2, blocking=False)
 
-        # Wait 2 seconds (should add 1 token)
-        time.sleep(2.0)
+        # 2 seconds should add 1 token
+        clock.advance(2.0)
 
-        tokens = limiter.get_tokens()
-        assert 0.9 <= tokens <= 1.1
+        assert limiter.get_tokens() == pytest.approx(1.0)
 
-    def test_large_burst(self):
+    def test_large_burst(self, make_limiter):
         """Test rate limiter with large burst capacity."""
-        limiter = RateLimiter(rate=100.0, burst=1000)
+        limiter = make_limiter(rate=100.0, burst=1000)
         assert limiter.get_tokens() == 1000.0
 
         # Should handle large acquisitions
         success = limiter.acquire(tokens=500, blocking=False)
         assert success is True
-        assert 499.0 <= limiter.get_tokens() <= 500.1
+        assert limiter.get_tokens() == 500.0
 
-    def test_high_rate(self):
+    def test_high_rate(self, make_limiter, clock):
         """Test rate limiter with high rate."""
-        limiter = RateLimiter(rate=1000.0, burst=100)
+        limiter = make_limiter(rate=1000.0, burst=100)
 
         # Consume all
         limiter.acquire(tokens=100, blocking=False)
 
-        # Wait 0.1 second (should add 100 tokens at 1000/sec)
-        time.sleep(0.1)
+        # 0.1 second adds 100 tokens at 1000/sec
+        clock.advance(0.1)
 
-        tokens = limiter.get_tokens()
-        assert 90.0 <= tokens <= 100.0  # Should be capped at burst
+        assert limiter.get_tokens() == pytest.approx(100.0)
 
-    def test_very_small_timeout(self):
+    def test_very_small_timeout(self, make_limiter):
         """Test acquire with very small timeout."""
-        limiter = RateLimiter(rate=1.0, burst=1)
+        limiter = make_limiter(rate=1.0, burst=1)
         limiter.acquire(tokens=1, blocking=False)
 
         # Try with extremely small timeout
         success = limiter.acquire(tokens=1, blocking=True, timeout=0.001)
         assert success is False
 
-    def test_multiple_small_acquires(self):
+    def test_multiple_small_acquires(self, make_limiter):
         """Test multiple small token acquisitions."""
-        limiter = RateLimiter(rate=10.0, burst=10)
+        limiter = make_limiter(rate=10.0, burst=10)
 
         # Acquire 10 times, 1 token each
         for i in range(10):
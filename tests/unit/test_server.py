@@ -5,11 +5,43 @@ Unit tests for server components (LRUCache, ClientHandler utilities)
 
 import unittest
 import asyncio
+import pytest
 from unittest.mock import Mock, MagicMock, patch, AsyncMock
 from queue import Queue
 from io import BytesIO
 
-from server.server import LRUCache, ClientHandler
+from server.protocol import ValidationError, create_event_message
+from server.server import LRUCache, ClientHandler, _extract_agent_id
+
+# Keys are built once so the loops below time the cache, not string formatting
+NONCE_KEYS = tuple(map("nonce{}".format, range(1001)))
+
+
+def _extra_info(**info):
+    """Stand-in for StreamWriter.get_extra_info returning the given values."""
+    return lambda name, default=None: info.get(name, default)
+
+
+# spec= mocks introspect the whole class, so build them once per module.
+# Tests using these must only read from them, never reconfigure them.
+@pytest.fixture(scope="module")
+def mock_reader():
+    """Shared stream reader mock."""
+    return AsyncMock(spec=asyncio.StreamReader)
+
+
+@pytest.fixture(scope="module")
+def mock_writer():
+    """Shared stream writer mock for a connection without TLS info."""
+    writer = MagicMock(spec=asyncio.StreamWriter)
+    writer.get_extra_info.return_value = None
+    return writer
+
+
+@pytest.fixture(scope="module")
+def shared_nonce_cache():
+    """Shared nonce cache for tests that never add to it."""
+    return LRUCache()
 
 
 class TestLRUCache(unittest.TestCase):
@@ -31,11 +63,12 @@ class TestLRUCache(unittest.TestCase):
     def test_add_multiple_items(self):
         """Test adding multiple items."""
         cache = LRUCache(max_size=10)
-        for i in range(5):
-            cache.add(f"nonce{i}")
+        keys = NONCE_KEYS[:5]
+        for key in keys:
+            cache.add(key)
         self.assertEqual(cache.size(), 5)
-        for i in range(5):
-            self.assertTrue(cache.contains(f"nonce{i}"))
+        for key in keys:
+            self.assertTrue(cache.contains(key))
 
     def test_add_duplicate_moves_to_end(self):
         """Test that adding duplicate moves it to end (LRU behavior)."""
@@ -74,6 +107,31 @@ class TestLRUCache(unittest.TestCase):
         self.assertTrue(cache.contains("nonce3"))
         self.assertTrue(cache.contains("nonce4"))
 
+    def test_contains_does_not_refresh(self):
+        """Test that a membership check does not change eviction order."""
+        cache = LRUCache(max_size=2)
+        cache.add("nonce1")
+        cache.add("nonce2")
+
+        self.assertTrue(cache.contains("nonce1"))
+        cache.add("nonce3")
+
+        self.assertFalse(cache.contains("nonce1"))
+        self.assertTrue(cache.contains("nonce2"))
+
+    def test_check_and_add(self):
+        """Test check_and_add inserts fresh keys and reports duplicates."""
+        cache = LRUCache(max_size=2)
+        self.assertTrue(cache.check_and_add("nonce1"))
+        self.assertTrue(cache.check_and_add("nonce2"))
+        self.assertFalse(cache.check_and_add("nonce1"))
+
+        # nonce1 was refreshed by the duplicate, so nonce2 is evicted
+        self.assertTrue(cache.check_and_add("nonce3"))
+        self.assertEqual(cache.size(), 2)
+        self.assertFalse(cache.contains("nonce2"))
+        self.assertTrue(cache.contains("nonce1"))
+
     def test_contains_missing_item(self):
         """Test checking for non-existent item."""
         cache = LRUCache(max_size=10)
@@ -84,15 +142,17 @@ class TestLRUCache(unittest.TestCase):
         """Test cache with many items."""
         cache = LRUCache(max_size=1000)
 
+        keys = NONCE_KEYS[:1000]
+
         # Add 1000 items
-        for i in range(1000):
-            cache.add(f"nonce{i}")
+        for key in keys:
+            cache.add(key)
 
         self.assertEqual(cache.size(), 1000)
 
         # All should be present
-        for i in range(1000):
-            self.assertTrue(cache.contains(f"nonce{i}"))
+        for key in keys:
+            self.assertTrue(cache.contains(key))
 
         # Add one more, should evict nonce0
         cache.add("nonce1000")
@@ -136,12 +196,10 @@ class TestClientHandler(unittest.TestCase):
 
     def test_init_with_cert(self):
         """Test ClientHandler initialization with agent certificate."""
-        # Mock SSL object with certificate
-        mock_ssl = Mock()
-        mock_ssl.getpeercert.return_value = {
-            "subject": ((("commonName", "agent123"),),)
-        }
-        self.writer.get_extra_info.return_value = mock_ssl
+        # Peer certificate as already decoded by the TLS transport
+        self.writer.get_extra_info.side_effect = _extra_info(
+            peercert={"subject": ((("commonName", "agent123"),),)}
+        )
 
         handler = ClientHandler(
             self.reader,
@@ -157,6 +215,57 @@ class TestClientHandler(unittest.TestCase):
         self.assertEqual(handler.addr, self.addr)
         self.assertFalse(handler.is_authenticated)
 
+    def test_init_with_multi_attribute_subject(self):
+        """Test commonName is found in any position of the certificate subject."""
+        self.writer.get_extra_info.side_effect = _extra_info(
+            peercert={
+                "subject": (
+                    (("countryName", "NP"),),
+                    (("organizationName", "HoneyGrid"), ("commonName", "agent456")),
+                )
+            }
+        )
+
+        handler = ClientHandler(
+            self.reader,
+            self.writer,
+            self.db,
+            self.nonce_cache,
+            self.event_queue,
+            self.notifiers,
+            self.addr,
+        )
+
+        self.assertEqual(handler.agent_id, "agent456")
+
+    def test_init_with_precomputed_agent_id(self):
+        """Test a supplied agent_id skips certificate parsing."""
+        handler = ClientHandler(
+            self.reader,
+            self.writer,
+            self.db,
+            self.nonce_cache,
+            self.event_queue,
+            self.notifiers,
+            self.addr,
+            agent_id="agent789",
+        )
+
+        self.assertEqual(handler.agent_id, "agent789")
+        self.writer.get_extra_info.assert_not_called()
+
+    def test_extract_agent_id(self):
+        """Test agent ID extraction with and without a peer certificate."""
+        self.writer.get_extra_info.side_effect = _extra_info(
+            peercert={"subject": ((("commonName", "agent123"),),)}
+        )
+        self.assertEqual(_extract_agent_id(self.writer, self.addr), "agent123")
+
+        self.writer.get_extra_info.side_effect = _extra_info()
+        self.assertEqual(
+            _extract_agent_id(self.writer, self.addr), "unknown_127.0.0.1_12345"
+        )
+
     def test_init_stores_references(self):
         """Test that ClientHandler stores all required references."""
         self.writer.get_extra_info.return_value = None
@@ -177,6 +286,48 @@ class TestClientHandler(unittest.TestCase):
         self.assertIs(handler.nonce_cache, self.nonce_cache)
         self.assertIs(handler.event_queue, self.event_queue)
 
+    def test_event_pushed_to_bounded_queue(self):
+        """Test handled events reach the GUI queue, skipping new ones when full."""
+        self.writer.get_extra_info.return_value = None
+        self.db.insert_event.side_effect = [1, 2]
+        event_queue = Queue(maxsize=1)
+
+        handler = ClientHandler(
+            self.reader,
+            self.writer,
+            self.db,
+            self.nonce_cache,
+            event_queue,
+            self.notifiers,
+            self.addr,
+        )
+        for path in ("/honey/a.txt", "/honey/b.txt"):
+            message = create_event_message(handler.agent_id, "token-1", path, "opened")
+            asyncio.run(handler._handle_event(message))
+
+        self.assertEqual(event_queue.qsize(), 1)
+        queued = event_queue.get_nowait()
+        self.assertEqual(queued["event_id"], 1)
+        self.assertEqual(queued["data"]["path"], "/honey/a.txt")
+
+    def test_replayed_message_rejected(self):
+        """Test a message whose nonce was already seen raises ValidationError."""
+        handler = ClientHandler(
+            self.reader,
+            self.writer,
+            self.db,
+            self.nonce_cache,
+            self.event_queue,
+            self.notifiers,
+            self.addr,
+            agent_id="agent123",
+        )
+        message = create_event_message("agent123", "token-1", "/honey/a", "opened")
+
+        asyncio.run(handler._process_message(message))
+        with self.assertRaises(ValidationError):
+            asyncio.run(handler._process_message(message))
+
     def test_message_count_initial(self):
         """Test that message count starts at zero."""
         self.writer.get_extra_info.return_value = None
@@ -236,82 +387,56 @@ class TestLRUCacheEdgeCases:
 class TestClientHandlerProperties:
     """Test ClientHandler properties and attributes."""
 
-    def test_handler_has_reader(self):
-        """Test handler has reader attribute."""
-        reader = AsyncMock(spec=asyncio.StreamReader)
-        writer = MagicMock(spec=asyncio.StreamWriter)
-        writer.get_extra_info.return_value = None
-
-        handler = ClientHandler(
-            reader, writer, Mock(), LRUCache(), Queue(), [], ("127.0.0.1", 12345)
+    @pytest.fixture
+    def handler(self, mock_reader, mock_writer, shared_nonce_cache):
+        """ClientHandler built from the shared module-scoped mocks."""
+        return ClientHandler(
+            mock_reader,
+            mock_writer,
+            Mock(),
+            shared_nonce_cache,
+            Queue(),
+            [],
+            ("127.0.0.1", 12345),
         )
+
+    def test_handler_has_reader(self, handler):
+        """Test handler has reader attribute."""
         assert hasattr(handler, "reader")
 
-    def test_handler_has_writer(self):
+    def test_handler_has_writer(self, handler):
         """Test handler has writer attribute."""
-        reader = AsyncMock(spec=asyncio.StreamReader)
-        writer = MagicMock(spec=asyncio.StreamWriter)
-        writer.get_extra_info.return_value = None
-
-        handler = ClientHandler(
-            reader, writer, Mock(), LRUCache(), Queue(), [], ("127.0.0.1", 12345)
-        )
         assert hasattr(handler, "writer")
 
-    def test_handler_has_db(self):
+    def test_handler_has_db(self, handler):
         """Test handler has db attribute."""
-        reader = AsyncMock(spec=asyncio.StreamReader)
-        writer = MagicMock(spec=asyncio.StreamWriter)
-        writer.get_extra_info.return_value = None
-
-        handler = ClientHandler(
-            reader, writer, Mock(), LRUCache(), Queue(), [], ("127.0.0.1", 12345)
-        )
         assert hasattr(handler, "db")
 
-    def test_handler_has_nonce_cache(self):
+    def test_handler_has_nonce_cache(self, handler):
         """Test handler has nonce_cache attribute."""
-        reader = AsyncMock(spec=asyncio.StreamReader)
-        writer = MagicMock(spec=asyncio.StreamWriter)
-        writer.get_extra_info.return_value = None
-
-        handler = ClientHandler(
-            reader, writer, Mock(), LRUCache(), Queue(), [], ("127.0.0.1", 12345)
-        )
         assert hasattr(handler, "nonce_cache")
 
-    def test_handler_has_event_queue(self):
+    def test_handler_has_event_queue(self, handler):
         """Test handler has event_queue attribute."""
-        reader = AsyncMock(spec=asyncio.StreamReader)
-        writer = MagicMock(spec=asyncio.StreamWriter)
-        writer.get_extra_info.return_value = None
-
-        handler = ClientHandler(
-            reader, writer, Mock(), LRUCache(), Queue(), [], ("127.0.0.1", 12345)
-        )
         assert hasattr(handler, "event_queue")
 
-    def test_handler_has_addr(self):
+    def test_handler_has_addr(self, mock_reader, mock_writer, shared_nonce_cache):
         """Test handler has addr attribute."""
-        reader = AsyncMock(spec=asyncio.StreamReader)
-        writer = MagicMock(spec=asyncio.StreamWriter)
-        writer.get_extra_info.return_value = None
         addr = ("192.168.1.100", 9000)
 
-        handler = ClientHandler(reader, writer, Mock(), LRUCache(), Queue(), [], addr)
+        handler = ClientHandler(
+            mock_reader, mock_writer, Mock(), shared_nonce_cache, Queue(), [], addr
+        )
         assert handler.addr == addr
 
-    def test_handler_is_authenticated_false(self):
+    def test_handler_is_authenticated_false(self, handler):
         """Test handler is_authenticated starts as False."""
-        reader = AsyncMock(spec=asyncio.StreamReader)
-        writer = MagicMock(spec=asyncio.StreamWriter)
-        writer.get_extra_info.return_value = None
-
-        handler = ClientHandler(
-            reader, writer, Mock(), LRUCache(), Queue(), [], ("127.0.0.1", 12345)
-        )
         assert handler.is_authenticated is False
 
+    def test_handler_is_slotted(self, handler):
+        """Test handler carries no per-instance __dict__."""
+        assert not hasattr(handler, "__dict__")
+
 
 class TestClientHandlerWithDifferentCerts:
     """Test ClientHandler with different certificate scenarios."""
@@ -321,11 +446,9 @@ class TestClientHandlerWithDifferentCerts:
         reader = AsyncMock(spec=asyncio.StreamReader)
         writer = MagicMock(spec=asyncio.StreamWriter)
 
-        mock_ssl = Mock()
-        mock_ssl.getpeercert.return_value = {
-            "subject": ((("commonName", "test-agent-001"),),)
-        }
-        writer.get_extra_info.return_value = mock_ssl
+        writer.get_extra_info.side_effect = _extra_info(
+            peercert={"subject": ((("commonName", "test-agent-001"),),)}
+        )
 
         handler = ClientHandler(
             reader, writer, Mock(), LRUCache(), Queue(), [], ("127.0.0.1", 12345)
@@ -337,11 +460,9 @@ class TestClientHandlerWithDifferentCerts:
         reader = AsyncMock(spec=asyncio.StreamReader)
         writer = MagicMock(spec=asyncio.StreamWriter)
 
-        mock_ssl = Mock()
-        mock_ssl.getpeercert.return_value = {
-            "subject": ((("organizationName", "Test Org"),),)
-        }
-        writer.get_extra_info.return_value = mock_ssl
+        writer.get_extra_info.side_effect = _extra_info(
+            peercert={"subject": ((("organizationName", "Test Org"),),)}
+        )
 
         handler = ClientHandler(
             reader, writer, Mock(), LRUCache(), Queue(), [], ("127.0.0.1", 12345)
@@ -353,9 +474,7 @@ class TestClientHandlerWithDifferentCerts:
         reader = AsyncMock(spec=asyncio.StreamReader)
         writer = MagicMock(spec=asyncio.StreamWriter)
 
-        mock_ssl = Mock()
-        mock_ssl.getpeercert.return_value = None
-        writer.get_extra_info.return_value = mock_ssl
+        writer.get_extra_info.side_effect = _extra_info(peercert=None)
 
         handler = ClientHandler(
             reader, writer, Mock(), LRUCache(), Queue(), [], ("10.0.0.1", 8443)
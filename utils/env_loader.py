@@ -2,28 +2,74 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
+# Set once a load has run; later load_env() calls are no-ops unless forced
+_LOADED: bool = False
 
-def load_env() -> bool:
+# cwd -> .env path found from it. Misses are not cached, so a .env created
+# later is still picked up by load_env(force=True).
+_DOTENV_PATHS: dict[str, str] = {}
+
+
+def _resolve_dotenv(cwd: str) -> str | None:
+    """
+    Locate the .env file for a working directory.
+
+    find_dotenv walks up from the cwd stat-ing every parent, so a found
+    path is memoized per cwd; the agent, server and GUI each call load_env().
+
+    Args:
+        cwd: Working directory the lookup starts from (the cache key)
+
+    Returns:
+        Path to the .env file, or None if there is none.
+    """
+    cached = _DOTENV_PATHS.get(cwd)
+    if cached is not None:
+        return cached
+
+    from dotenv import find_dotenv
+
+    dotenv_path = find_dotenv(usecwd=True)
+    if not dotenv_path:
+        # Fallback: check workspace root .env
+        candidate = Path(cwd) / ".env"
+        if not candidate.exists():
+            return None
+        dotenv_path = str(candidate)
+
+    _DOTENV_PATHS[cwd] = dotenv_path
+    return dotenv_path
+
+
+def load_env(force: bool = False) -> bool:
     """
     Load environment variables from a .env file if present.
 
+    Only the first call reads the file; entry points that each call this
+    on import share that one load.
+
+    Args:
+        force: Re-read the .env file even if it was already loaded
+
     Returns:
         True if python-dotenv is available, False otherwise.
     """
+    global _LOADED
+
     try:
-        from dotenv import find_dotenv, load_dotenv
+        from dotenv import load_dotenv
     except Exception:
         return False
 
-    dotenv_path = find_dotenv(usecwd=True)
+    if _LOADED and not force:
+        return True
+
+    dotenv_path = _resolve_dotenv(os.getcwd())
     if dotenv_path:
         load_dotenv(dotenv_path, override=True)
-    else:
-        # Fallback: check workspace root .env
-        candidate = Path.cwd() / ".env"
-        if candidate.exists():
-            load_dotenv(candidate, override=True)
 
+    _LOADED = True
     return True